@@ -53,7 +53,7 @@ def handle_job_automation(request: Request):
         job_service.update_task_references(
             task_id=task_id,
             budget_url=budget_info['budget_url'],
-            budget_list_id=budget_info['list_id']
+            budget_list_id=job_structure['list_id']
         )
         
         # Update audit log
@@ -67,7 +67,7 @@ def handle_job_automation(request: Request):
             'status': 'success',
             'task_id': task_id,
             'budget_url': budget_info['budget_url'],
-            'list_id': budget_info['list_id']
+            'list_id': job_structure['list_id']
         }
         
         return (json.dumps(response), 200, {'Content-Type': 'application/json'})
@@ -12,7 +12,7 @@ logger.setLevel(logging.INFO)
 
 def extract_spreadsheet_details(url: str) -> tuple:
     """Extracts the spreadsheet ID and sheet GID from a Google Sheets URL."""
-    logger.debug(f"Attempting to extract details from URL: {url}")
+    logger.debug("Attempting to extract details from URL: %s", url)
     match = re.search(r'/d/([a-zA-Z0-9-_]+)', url)
     if not match:
         logger.error(f"Failed to extract spreadsheet ID from URL: {url}")
@@ -25,7 +25,7 @@ def extract_spreadsheet_details(url: str) -> tuple:
         raise ValueError(f"Invalid URL: Sheet GID not found in '{url}'")
     sheet_gid = match_gid.group(1)
     
-    logger.debug(f"Successfully extracted spreadsheet_id: {spreadsheet_id}, sheet_gid: {sheet_gid}")
+    logger.debug("Successfully extracted spreadsheet_id: %s, sheet_gid: %s", spreadsheet_id, sheet_gid)
     return spreadsheet_id, sheet_gid
 
 
@@ -91,7 +91,8 @@ def lambda_handler(event, context):
         if processed_data:
             logger.info("Budget processing completed successfully")
             # Use the custom encoder for all JSON operations
-            logger.debug(f"Processed data: {json.dumps(processed_data, cls=BudgetEncoder)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processed data: %s", json.dumps(processed_data, cls=BudgetEncoder))
             response = {
                 "status": "success",
                 "data": processed_data
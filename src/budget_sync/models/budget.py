@@ -3,6 +3,42 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional
 
+# Class-level totals written onto every serialized line item
+LINE_ITEM_CLASS_TOTAL_FIELDS = (
+    'class_estimate_subtotal',
+    'class_estimate_pnw',
+    'class_estimate_total',
+    'class_actual_subtotal',
+    'class_actual_pnw',
+    'class_actual_total',
+)
+
+# P&W cells hold rates (e.g. "28%", parsed to 0.28), so they serialize as percentages
+LINE_ITEM_CLASS_RATE_FIELDS = frozenset({'class_estimate_pnw', 'class_actual_pnw'})
+
+def format_money(value: Optional[float]) -> Optional[str]:
+    """Format a parsed amount as a '$x,xxx.xx' string ('-$x,xxx.xx' if negative), passing None and strings through."""
+    if isinstance(value, (int, float)):
+        return f"{'-' if value < 0 else ''}${abs(value):,.2f}"
+    return value
+
+def format_percent(value: Optional[float]) -> Optional[str]:
+    """Format a parsed rate as a percentage string (0.28 -> '28%'), passing None and strings through."""
+    if isinstance(value, (int, float)):
+        return f"{round(value * 100, 4):g}%"
+    return value
+
+def flatten_line_item(item: Dict) -> Dict:
+    """Expand a line item's shared ``class_totals`` dict into flat, formatted class_* fields."""
+    class_totals = item.get('class_totals')
+    if not isinstance(class_totals, dict):
+        return item
+    flat = {key: value for key, value in item.items() if key != 'class_totals'}
+    for field_name in LINE_ITEM_CLASS_TOTAL_FIELDS:
+        formatter = format_percent if field_name in LINE_ITEM_CLASS_RATE_FIELDS else format_money
+        flat[field_name] = formatter(class_totals.get(field_name))
+    return flat
+
 @dataclass
 class ValidationResult:
     """Validation result with messages."""
@@ -118,7 +154,7 @@ class BudgetClass:
             'actual_pnw': self.actual_pnw,
             'actual_total': self.actual_total,
             'line_items': [
-                item.to_dict() if hasattr(item, 'to_dict') else item 
+                item.to_dict() if hasattr(item, 'to_dict') else flatten_line_item(item)
                 for item in self.line_items
             ],
             'validation': self.validation.__dict__ if self.validation else None
@@ -58,6 +58,9 @@ def parse_google_sheets_url(url: str) -> Dict[str, str]:
         'description': f"Budget from spreadsheet {spreadsheet_id}"
     }
 
+# Currency and percent signs and thousands separators dropped before float conversion
+_MONEY_STRIP = str.maketrans('', '', '$%,')
+
 def clean_money_value(value: Any) -> float:
     """Convert a monetary value (string or number) to float.
     
@@ -76,10 +79,8 @@ def clean_money_value(value: Any) -> float:
     
     # Convert string to float
     try:
-        # Remove $ and % signs
-        value = str(value).replace('$', '').replace('%', '')
-        # Remove commas
-        value = value.replace(',', '')
+        # Remove $ and % signs and commas
+        value = str(value).translate(_MONEY_STRIP)
         # Convert to float
         return float(value)
     except (ValueError, TypeError):
@@ -118,6 +119,9 @@ def clean_date_value(value: Any) -> str:
         logger.warning(f"Error processing date value '{value}': {str(e)}, using today's date")
         return datetime.now(timezone.utc).date().isoformat()
 
+# Everything except digits and the minus sign, stripped before int conversion
+_NON_INT_CHARS_RE = re.compile(r'[^\d-]+')
+
 def safe_int_convert(value: Any, default: int = 0) -> int:
     """Safely convert a value to integer with fallback to default."""
     if value is None or value == '':
@@ -125,7 +129,7 @@ def safe_int_convert(value: Any, default: int = 0) -> int:
     try:
         if isinstance(value, str):
             # Remove any non-numeric characters (except negative sign)
-            cleaned = ''.join(c for c in value if c.isdigit() or c == '-')
+            cleaned = _NON_INT_CHARS_RE.sub('', value)
             return int(cleaned) if cleaned else default
         return int(value)
     except (ValueError, TypeError):
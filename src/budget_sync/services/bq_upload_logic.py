@@ -1,5 +1,6 @@
 import time
 import logging
+from itertools import islice
 
 logger = logging.getLogger(__name__)
 
@@ -34,31 +35,62 @@ def upload_cover_sheet_to_bq(bq_client, dataset_id, table_id, cover_sheet_row, m
     return False
 
 
-def upload_line_items_to_bq(bq_client, dataset_id, table_id, line_items_rows, max_retries=3):
+def upload_line_items_to_bq(bq_client, dataset_id, table_id, line_items_rows, max_retries=3, chunk_size=500):
     """
     Uploads line items rows to BigQuery using insert_rows_json.
 
+    Rows are sent in chunks of ``chunk_size``. Each row gets a stable insert ID built from its
+    budget_id, class_code, line_item_number and position, so BigQuery de-duplicates rows
+    that are re-sent when a chunk or the whole upload is retried.
+
+    The class_* total columns are normalized by flatten_line_item, not copied from the sheet:
+    amounts are '$x,xxx.xx' ('-$x,xxx.xx' for negatives) and P&W rates are percentages such as
+    '28%'. Rows uploaded before this normalization hold the sheet's displayed text with a '$'
+    prepended (e.g. '$1234.5', '$28%'), so queries across both need to handle either form.
+
     Args:
       bq_client: An instance of google.cloud.bigquery.Client.
       dataset_id: The BigQuery dataset ID.
       table_id: The BigQuery table ID for budget details.
-      line_items_rows: A list of dictionaries, each representing a row for the budget_details table.
-      max_retries: Maximum number of retries before failing.
+      line_items_rows: An iterable of dictionaries, each representing a row for the budget_details table.
+      max_retries: Maximum number of retries per chunk before failing.
+      chunk_size: Number of rows sent per insert_rows_json call.
 
     Returns:
       True if upload is successful, False otherwise.
     """
     table_ref = f"{bq_client.project}.{dataset_id}.{table_id}"
+    rows_iter = enumerate(line_items_rows)
+    uploaded = 0
+    while True:
+        chunk = list(islice(rows_iter, chunk_size))
+        if not chunk:
+            break
+        rows = [row for _, row in chunk]
+        row_ids = [_line_item_row_id(row, position) for position, row in chunk]
+        if not _insert_chunk(bq_client, table_ref, rows, row_ids, max_retries):
+            return False
+        uploaded += len(rows)
+    logger.info("Uploaded %d line items to BigQuery successfully.", uploaded)
+    return True
+
+
+def _line_item_row_id(row, position):
+    """Stable insert ID for a line item row, e.g. 'Budget-1.0.1:A:3:2'."""
+    return f"{row.get('budget_id', '')}:{row.get('class_code', '')}:{row.get('line_item_number', '')}:{position}"
+
+
+def _insert_chunk(bq_client, table_ref, rows, row_ids, max_retries):
+    """Insert one chunk of line item rows with retries. Returns True on success."""
     for attempt in range(max_retries):
         try:
-            errors = bq_client.insert_rows_json(table_ref, line_items_rows)
+            errors = bq_client.insert_rows_json(table_ref, rows, row_ids=row_ids)
             if errors:
                 logger.error("Errors uploading line items: %s", errors)
                 raise Exception(f"BigQuery insertion errors: {errors}")
-            logger.info("Uploaded %d line items to BigQuery successfully.", len(line_items_rows))
             return True
         except Exception as e:
             wait_time = 2 ** attempt
             logger.error("Error uploading line items to BigQuery (attempt %s): %s. Retrying in %s seconds...", attempt+1, e, wait_time)
             time.sleep(wait_time)
-    return False 
\ No newline at end of file
+    return False
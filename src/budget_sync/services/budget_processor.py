@@ -6,14 +6,19 @@ import logging
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+import copy
+import hashlib
 import json
 from typing import Dict, List, Any, Optional, Tuple
 import time
 import os
+import shutil
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from src.budget_sync.models.budget import Budget, BudgetClass, BudgetLineItem, ValidationResult
+from src.budget_sync.models.budget import Budget, BudgetClass, BudgetLineItem, ValidationResult, flatten_line_item, format_money
 from src.budget_sync.services.bigquery_service import BigQueryService
 from googleapiclient.errors import HttpError
 import re
@@ -21,16 +26,174 @@ from src.budget_sync.services.cover_sheet_processor import process_cover_sheet
 from google.cloud import bigquery
 from src.budget_sync.services.bq_uploader import format_cover_sheet_for_bq, format_line_items_for_bq
 from src.budget_sync.services.bq_upload_logic import upload_cover_sheet_to_bq, upload_line_items_to_bq
+from src.budget_sync.utils.retry import is_rate_limited, retry_delay
 
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the entry points (scripts, Lambda handler), not by this module
 logger = logging.getLogger(__name__)
 
+# Runs of characters that are not letters or digits, collapsed to '_' in file/sheet names
+_NON_ALNUM_RE = re.compile(r'[\W_]+')
+
+# Version history per file/sheet, read once per processor and written by flush_version_tracking
+_VERSION_TRACKING_FILE = Path('output/version_tracking.json')
+
+# Currency symbol and thousands separators dropped before parsing money strings
+_MONEY_STRIP = str.maketrans('', '', '$,')
+
+
+# OAuth credentials shared by processor instances in this process; replaced once they expire
+_cached_creds = None
+
+
+def _clean_name(value: str) -> str:
+    """Collapse non-alphanumeric runs in a title to single underscores (e.g. 'My Budget (v2)' -> 'My_Budget_v2')."""
+    return _NON_ALNUM_RE.sub('_', value).strip('_')
+
+
+# Total cells read for every class, in the order they appear in class totals
+_CLASS_TOTAL_FIELDS = (
+    'class_estimate_subtotal', 'class_actual_subtotal',
+    'class_estimate_pnw', 'class_actual_pnw',
+    'class_estimate_total', 'class_actual_total',
+    'class_client_total',
+)
+
+
+# Line item columns per class as (field, row index); index 0/1 are the line number and description
+_LINE_ITEM_COLUMNS = {
+    'A': (('estimate_days', 2), ('estimate_rate', 3), ('estimate_total', 4),
+          ('actual_days', 5), ('actual_rate', 6), ('actual_total', 7)),
+    'B': (('estimate_days', 2), ('estimate_rate', 3), ('estimate_ot_rate', 4), ('estimate_ot_hours', 5),
+          ('estimate_total', 6), ('actual_days', 7), ('actual_rate', 8), ('actual_total', 9)),
+    'F': (('estimate_number', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_total', 5)),
+    'G': (('estimate_days', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_total', 5)),
+    'H': (('estimate_number', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_total', 5)),
+    'K': (('estimate_hours', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_hours', 5), ('actual_total', 6)),
+    'L': (('estimate_days', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_hours', 5), ('actual_total', 6)),
+    'M2': (('estimate_number', 2), ('estimate_days', 3), ('estimate_rate', 4), ('estimate_total', 5), ('actual_total', 6)),
+    'O': (('estimate_hours', 2), ('estimate_rate', 3), ('estimate_total', 4), ('actual_hours', 5), ('actual_total', 6)),
+}
+
+# Number, days, rate, total layout shared by classes C, D, E, I, J and the remaining classes
+_DEFAULT_LINE_ITEM_COLUMNS = (
+    ('estimate_number', 2), ('estimate_days', 3), ('estimate_rate', 4), ('estimate_total', 5), ('actual_total', 6),
+)
+
+# Line item values reported as empty in debug logs, and the keys that scan skips
+_EMPTY_VALUES = frozenset({None, '', '$0.00', '0', 0})
+_EMPTY_CHECK_SKIP_KEYS = frozenset({'validation_status', 'validation_messages', 'class_totals'})
+
+# Classes whose line item totals are stored with a '$' prefix
+_DOLLAR_PREFIXED_CLASSES = frozenset({'L', 'M2'})
+
+
+def _dollar_prefixed(value: Any) -> Optional[str]:
+    """Return ``value`` as a string with a leading '$' (None if blank)."""
+    if not value:
+        return None
+    text = value if isinstance(value, str) else str(value)
+    return text if text[:1] == '$' else '$' + text
+
+
+def _money_cell(cell_values: List) -> float:
+    """Parse the first value of a fetched single-cell range as a number (0.0 if blank).
+
+    Handles '$' and thousands separators; percentages become fractions (e.g. "28%" -> 0.28) and
+    accounting-style negatives become negative numbers (e.g. "($1,234.00)" -> -1234.0).
+    """
+    value = cell_values[0][0] if cell_values and cell_values[0] else None
+    if not value:
+        return 0.0
+    try:
+        if isinstance(value, str):
+            value = value.translate(_MONEY_STRIP).strip()
+            if value[:1] == '(' and value[-1:] == ')':
+                value = '-' + value[1:-1]
+            if value.endswith('%'):
+                return float(value.rstrip('%')) / 100
+        return float(value)
+    except (ValueError, TypeError):
+        logger.warning("Could not convert value '%s' to float, using 0.0", value)
+        return 0.0
+
+
+def _make_line_item_validator(class_code: str, required_fields: List[str]):
+    """Build the line item validator for one class, with its required fields and checks fixed up front."""
+    required = tuple(required_fields)
+    check_overtime = class_code == 'B'
+
+    def validate(line_item: Dict) -> List[str]:
+        get = line_item.get
+        messages = [f"Missing required field: {field}" for field in required if not get(field)]
+        
+        # Validate rate and days combinations
+        if get('estimate_rate') and not get('estimate_days'):
+            messages.append("Has estimate rate but missing days")
+        if get('actual_rate') and not get('actual_days'):
+            messages.append("Has actual rate but missing days")
+        
+        # Class B specific validations
+        if check_overtime:
+            if get('estimate_ot_rate') and not get('estimate_ot_hours'):
+                messages.append("Has OT rate but missing hours")
+            if get('estimate_ot_hours') and not get('estimate_ot_rate'):
+                messages.append("Has OT hours but missing rate")
+        return messages
+
+    return validate
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """Atomically replace ``path`` with ``text`` unless it already holds exactly that content.
+
+    The replacement keeps the mode of an existing ``path``; new files are created owner-only,
+    since this also writes the OAuth token.
+    """
+    try:
+        if path.read_text() == text:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    if path.exists():
+        shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _class_cells(mapping: Dict) -> Tuple[Tuple[str, str], ...]:
+    """List the (field, A1 range) pairs needed to process one class, without the sheet prefix."""
+    cells = [
+        ('header', f"{mapping['class_code_cell']}:{mapping['class_name_cell']}"),
+        ('line_items', f"{mapping['line_items_range']['start']}:{mapping['line_items_range']['end']}"),
+    ]
+    for key in ['estimate', 'actual']:
+        cells.append((f'class_{key}_subtotal', mapping['subtotal_cells'][key]))
+        # P&W cells if they exist
+        if mapping['pw_cells'].get('estimate') is not None:
+            cells.append((f'class_{key}_pnw', mapping['pw_cells'][key]))
+        cells.append((f'class_{key}_total', mapping['total_cells'][key]))
+
+    # Add client total cell for Class K
+    if mapping.get('client_total_cell'):
+        cells.append(('class_client_total', mapping['client_total_cell']))
+
+    return tuple(cells)
+
+
 class BudgetValidationError(Exception):
     """Exception raised for errors in the budget validation."""
     pass
 
+class BudgetAuthenticationRequired(ValueError):
+    """Raised when there are no usable credentials and the interactive OAuth flow is not allowed."""
+    pass
+
 
 class BudgetProcessor:
     """Processes AICP budget data from Google Sheets."""
@@ -592,11 +755,21 @@ class BudgetProcessor:
         }
     }
     
-    def __init__(self, spreadsheet_id: str, gid: str = None):
-        """Initialize the budget processor with spreadsheet ID and sheet GID."""
+    def __init__(self, spreadsheet_id: str, gid: str = None, non_interactive: bool = False):
+        """Initialize the budget processor with spreadsheet ID and sheet GID.
+
+        With ``non_interactive`` (implied on Lambda), missing or unrefreshable credentials raise
+        BudgetAuthenticationRequired instead of starting the local-server OAuth flow.
+        """
         self.spreadsheet_id = spreadsheet_id
         self.gid = gid
+        self._sheet_info_cache = {}
+        self._cover_sheet_cache = {}
+        self._version_cache = {}
+        self._tracking_data = None
+        self._tracking_dirty = False
         
+        global _cached_creds
         try:
             # If modifying these scopes, delete the file token.json.
             SCOPES = [
@@ -604,29 +777,32 @@ class BudgetProcessor:
                 'https://www.googleapis.com/auth/drive'
             ]
 
+            # Reuse credentials loaded by an earlier instance (e.g. a warm Lambda) while still valid
+            creds = _cached_creds if _cached_creds is not None and _cached_creds.valid else None
+
             # If running in Lambda, copy token.json to /tmp
-            if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+            if creds is None and os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
                 if os.path.exists('token.json'):
                     import shutil
                     shutil.copy2('token.json', '/tmp/token.json')
                     logger.info("Copied token.json to /tmp for Lambda use")
 
-            creds = None
             # The file token.json stores the user's access and refresh tokens, and is
             # created automatically when the authorization flow completes for the first time.
-            if os.path.exists('/tmp/token.json'):
+            if creds is None and os.path.exists('/tmp/token.json'):
                 with open('/tmp/token.json', 'r') as token:
                     creds_data = json.load(token)
                     creds = Credentials.from_authorized_user_info(creds_data, SCOPES)
 
             # If there are no (valid) credentials available, let the user log in.
+            # Still-valid credentials (google-auth applies its own expiry skew) skip the refresh.
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
                     creds.refresh(Request())
                 else:
-                    # Check if we're running in Lambda
-                    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
-                        raise ValueError("No valid credentials found. Please run OAuth flow locally first.")
+                    # Check if we're running in Lambda or were asked not to prompt
+                    if non_interactive or os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+                        raise BudgetAuthenticationRequired("No valid credentials found. Please run OAuth flow locally first.")
                     else:
                         # We're running locally, so we can do the OAuth flow
                         flow = InstalledAppFlow.from_client_secrets_file(
@@ -634,52 +810,64 @@ class BudgetProcessor:
                         creds = flow.run_local_server(port=0)
                 # Save the credentials for the next run
                 token_path = '/tmp/token.json' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'token.json'
-                with open(token_path, 'w') as token:
-                    token.write(creds.to_json())
+                _write_if_changed(Path(token_path), creds.to_json())
 
-            logger.info(f"Using OAuth2 credentials for spreadsheet {spreadsheet_id}")
-            self.sheets_service = build('sheets', 'v4', credentials=creds)
-            
-            # Initialize BigQuery service
-            project_id = os.getenv('BIGQUERY_PROJECT_ID')
-            dataset_id = os.getenv('BIGQUERY_DATASET_ID')
-            
-            if project_id and dataset_id:
-                try:
-                    self.bigquery_service = BigQueryService(project_id, dataset_id)
-                    logger.info("✓ BigQuery service initialized successfully")
-                except Exception as e:
-                    logger.error(f"❌ Failed to initialize BigQuery service: {str(e)}")
-                    self.bigquery_service = None
-            else:
-                logger.warning("⚠️ BigQuery service not initialized - missing environment variables")
-                self.bigquery_service = None
+            logger.info("Using OAuth2 credentials for spreadsheet %s", spreadsheet_id)
+            _cached_creds = creds
+            self._creds = creds
+            self.sheets_service = build('sheets', 'v4', credentials=creds, cache_discovery=False)
 
         except Exception as e:
-            logger.error(f"Error initializing budget processor: {str(e)}")
+            logger.error("Error initializing budget processor: %s", e)
             raise
 
-    def _extract_row_from_cell(self, cell_ref: str) -> int:
-        """Extract the row number from a cell reference (e.g., 'L4' returns 4)."""
-        match = re.search(r'\d+', cell_ref)
-        if match:
-            return int(match.group())
-        return 0
+    @cached_property
+    def bigquery_service(self) -> Optional[BigQueryService]:
+        """BigQuery service, created on first use so sheet-only runs never connect to BigQuery."""
+        project_id = os.getenv('BIGQUERY_PROJECT_ID')
+        dataset_id = os.getenv('BIGQUERY_DATASET_ID')
+        
+        if not (project_id and dataset_id):
+            logger.warning("⚠️ BigQuery service not initialized - missing environment variables")
+            return None
+        try:
+            service = BigQueryService(project_id, dataset_id)
+            logger.info("✓ BigQuery service initialized successfully")
+            return service
+        except Exception as e:
+            logger.error("❌ Failed to initialize BigQuery service: %s", e)
+            return None
+
+    def _load_version_tracking(self) -> Dict:
+        """Return the version tracking data, reading the tracking file on first use."""
+        if self._tracking_data is None:
+            try:
+                with open(_VERSION_TRACKING_FILE) as f:
+                    self._tracking_data = json.load(f)
+            except (OSError, ValueError):
+                self._tracking_data = {}
+        return self._tracking_data
+
+    def flush_version_tracking(self) -> None:
+        """Write version tracking changes made during this run back to the tracking file."""
+        if not self._tracking_dirty:
+            return
+        try:
+            _write_if_changed(_VERSION_TRACKING_FILE, json.dumps(self._tracking_data, indent=2))
+            self._tracking_dirty = False
+        except OSError as e:
+            logger.warning("Could not save version tracking: %s", e)
 
     def _get_version_numbers(self, file_name: str, sheet_name: str, date_str: str, current_data: dict) -> tuple[int, int, int]:
         """Get version numbers based on file history and content changes."""
         try:
-            tracking_file = Path('output/version_tracking.json')
-            tracking_file.parent.mkdir(exist_ok=True)
-            
-            if tracking_file.exists():
-                with open(tracking_file) as f:
-                    tracking_data = json.load(f)
-            else:
-                tracking_data = {}
+            tracking_data = self._load_version_tracking()
             
             key = f"{file_name}-{sheet_name}"
-            current_hash = hash(str(current_data))
+            # Stable across processes, unlike hash(), so unchanged content is recognized between runs
+            current_hash = hashlib.blake2b(
+                json.dumps(current_data, sort_keys=True, default=str).encode(), digest_size=16
+            ).hexdigest()
             
             # Handle old format migration
             if key in tracking_data and isinstance(tracking_data[key], dict):
@@ -722,9 +910,8 @@ class BudgetProcessor:
                 
                 tracking_data[key]['last_updated'] = date_str
             
-            # Save updated tracking data
-            with open(tracking_file, 'w') as f:
-                json.dump(tracking_data, f, indent=2)
+            # Saved once per run by flush_version_tracking
+            self._tracking_dirty = True
             
             return (
                 tracking_data[key]['major_version'],
@@ -733,272 +920,113 @@ class BudgetProcessor:
             )
             
         except Exception as e:
-            logger.warning(f"Error getting version numbers: {e}. Using 1.0.1 as default.")
+            logger.warning("Error getting version numbers: %s. Using 1.0.1 as default.", e)
             return 1, 0, 1
 
-    def _generate_upload_id(self, spreadsheet_title: str, sheet_title: str) -> str:
-        """Generate a unique upload ID."""
+    def _cached_version(self, clean_file: str, clean_sheet: str, date_str: str) -> tuple[int, int, int]:
+        """Return version numbers for a file/sheet/date, computing them at most once per processor.
+
+        _get_version_numbers bumps the tracked patch version on every call, so memoizing per
+        instance also keeps the version stable when several steps of one run ask for it.
+        """
+        key = (clean_file, clean_sheet, date_str)
+        if key not in self._version_cache:
+            self._version_cache[key] = self._get_version_numbers(clean_file, clean_sheet, date_str, {})
+        return self._version_cache[key]
+
+    def _generate_upload_id(self, spreadsheet_title: str, sheet_title: str, now: Optional[datetime] = None) -> str:
+        """Generate a unique upload ID, dated from ``now`` (defaults to the current UTC time)."""
         # Clean file and sheet names
-        clean_file = '_'.join(''.join(c if c.isalnum() else ' ' for c in spreadsheet_title).split())
-        clean_sheet = '_'.join(''.join(c if c.isalnum() else ' ' for c in sheet_title).split())
+        clean_file = _clean_name(spreadsheet_title)
+        clean_sheet = _clean_name(sheet_title)
         
         # Generate date string
-        date_str = datetime.now(timezone.utc).strftime('%m-%d-%y')
+        date_str = (now or datetime.now(timezone.utc)).strftime('%m-%d-%y')
         
         # Get version numbers
-        major, minor, patch = self._get_version_numbers(clean_file, clean_sheet, date_str, {})
+        major, minor, patch = self._cached_version(clean_file, clean_sheet, date_str)
         version_str = f"{major}.{minor}.{patch}"
         
         return f"{clean_file}-{clean_sheet}-{date_str}_{version_str}"
 
-    def _get_class_totals(self, spreadsheet_id: str, sheet_title: str, mapping: Dict) -> Dict:
-        """Get class totals using batch request."""
-        values = {}
+    def _fetch_class_ranges(self, spreadsheet_id: str, sheet_title: str, class_codes: Optional[List[str]] = None) -> Dict[str, Dict[str, List]]:
+        """Fetch header, line item and total ranges for several classes in a single batch request.
+
+        Returns ``{class_code: {field: values}}``. Defaults to every class in CLASS_MAPPINGS.
+        """
+        if class_codes is None:
+            class_codes = list(_CLASS_CELLS)
+
+        prefix = f"'{sheet_title}'!"
+        fields = []
         ranges = []
-        
-        # Collect all ranges we need to fetch
-        for key in ['estimate', 'actual']:
-            # Subtotal cells
-            ranges.append(f"'{sheet_title}'!{mapping['subtotal_cells'][key]}")
-            
-            # P&W cells if they exist
-            if mapping['pw_cells'].get('estimate') is not None:
-                ranges.append(f"'{sheet_title}'!{mapping['pw_cells'][key]}")
-                
-            # Total cells
-            ranges.append(f"'{sheet_title}'!{mapping['total_cells'][key]}")
-        
-        # Add client total cell for Class K
-        if mapping.get('client_total_cell'):
-            ranges.append(f"'{sheet_title}'!{mapping['client_total_cell']}")
-        
-        # Fetch all ranges in one batch request
+        for class_code in class_codes:
+            for field_name, cell_range in _CLASS_CELLS[class_code]:
+                fields.append((class_code, field_name))
+                ranges.append(prefix + cell_range)
+
         results = self._get_range_values_batch(spreadsheet_id, ranges)
-        
-        # Process results
-        result_index = 0
-        
-        # Get subtotal values
-        for key in ['estimate', 'actual']:
-            value = results[result_index][0][0] if results[result_index] and results[result_index][0] else "$0.00"
-            # Ensure proper dollar sign formatting
-            if not isinstance(value, str) or not value.startswith('$'):
-                value = f"${value}" if value else "$0.00"
-            values[f'class_{key}_subtotal'] = value
-            result_index += 1
-        
-        # Get P&W values if they exist
-        if mapping['pw_cells'].get('estimate') is not None:
-            for key in ['estimate', 'actual']:
-                value = results[result_index][0][0] if results[result_index] and results[result_index][0] else "$0.00"
-                # Ensure proper dollar sign formatting
-                if not isinstance(value, str) or not value.startswith('$'):
-                    value = f"${value}" if value else "$0.00"
-                values[f'class_{key}_pnw'] = value
-                result_index += 1
-        else:
+        logger.debug("Fetched %s ranges for %s classes in one batch request", len(ranges), len(class_codes))
+
+        fetched = {class_code: {} for class_code in class_codes}
+        for (class_code, field_name), values in zip(fields, results):
+            fetched[class_code][field_name] = values
+        return fetched
+
+    def _get_class_totals(self, fetched: Dict[str, List]) -> Dict:
+        """Get class totals from the values fetched for the class."""
+        values = {
+            field_name: _money_cell(fetched[field_name])
+            for field_name in _CLASS_TOTAL_FIELDS
+            if field_name in fetched
+        }
+
+        # Classes without P&W cells (C-I) have no P&W totals
+        if 'class_estimate_pnw' not in fetched:
             values['class_estimate_pnw'] = None
             values['class_actual_pnw'] = None
-        
-        # Get total values
-        for key in ['estimate', 'actual']:
-            value = results[result_index][0][0] if results[result_index] and results[result_index][0] else "$0.00"
-            # Ensure proper dollar sign formatting
-            if not isinstance(value, str) or not value.startswith('$'):
-                value = f"${value}" if value else "$0.00"
-            values[f'class_{key}_total'] = value
-            result_index += 1
-            
-        # Get client total for Class K
-        if mapping.get('client_total_cell'):
-            value = results[result_index][0][0] if results[result_index] and results[result_index][0] else "$0.00"
-            # Ensure proper dollar sign formatting
-            if not isinstance(value, str) or not value.startswith('$'):
-                value = f"${value}" if value else "$0.00"
-            values['class_client_total'] = value
-        
+
         return values
 
     def _validate_line_item(self, line_item: Dict, class_code: str, row_number: int) -> List[str]:
         """Validate a line item and return any validation messages."""
-        messages = []
-        required_fields = self.CLASS_MAPPINGS[class_code]['required_fields']
-        
-        # Check required fields
-        for field in required_fields:
-            if not line_item.get(field):
-                messages.append(f"Missing required field: {field}")
-        
-        # Validate rate and days combinations
-        if line_item.get('estimate_rate') and not line_item.get('estimate_days'):
-            messages.append("Has estimate rate but missing days")
-        
-        if line_item.get('actual_rate') and not line_item.get('actual_days'):
-            messages.append("Has actual rate but missing days")
-        
-        # Class B specific validations
-        if class_code == 'B':
-            if line_item.get('estimate_ot_rate') and not line_item.get('estimate_ot_hours'):
-                messages.append("Has OT rate but missing hours")
-            if line_item.get('estimate_ot_hours') and not line_item.get('estimate_ot_rate'):
-                messages.append("Has OT hours but missing rate")
+        messages = _LINE_ITEM_VALIDATORS[class_code](line_item)
         
         # Log any validation issues
         if messages:
-            logger.debug(f"Validation issues in row {row_number}: {', '.join(messages)}")
+            logger.debug("Validation issues in row %s: %s", row_number, ', '.join(messages))
         
         return messages
 
-    def _process_line_item(self, row: List[Any], class_code: str, class_name: str, class_totals: Dict, row_number: int) -> Optional[Dict]:
+    def _process_line_item(self, row: List[Any], class_code: str, class_totals: Dict, row_number: int) -> Optional[Dict]:
         """Process a single line item with class totals."""
-        try:
-            # Clean class name - remove class code prefix if present
-            if class_name and ':' in class_name:
-                class_name = class_name.split(':', 1)[1].strip()
+        # Skip if no line number or description
+        if len(row) < 2 or not row[0] or not row[1]:
+            logger.debug("Skipping row %s in class %s - missing line number or description", row_number, class_code)
+            return None
 
+        try:
             # Process line item with class totals
             line_item = {
                 'line_item_number': row[0],
                 'line_item_description': row[1]
             }
-
-            # Skip if no line number or description
-            if not line_item['line_item_number'] or not line_item['line_item_description']:
-                logger.debug(f"Skipping row {row_number} in class {class_code} - missing line number or description")
-                return None
             
             # Add values based on class type
-            if class_code == 'M2':  # Additional Talent Expenses
-                # Get raw values first
-                estimate_number = row[2] if len(row) > 2 else None
-                estimate_days = row[3] if len(row) > 3 else None
-                estimate_rate = row[4] if len(row) > 4 else None
-                estimate_total = row[5] if len(row) > 5 else None
-                actual_total = row[6] if len(row) > 6 else None
-                
-                # Update line item with properly formatted values
-                line_item.update({
-                    'estimate_number': estimate_number,  # Keep as is for number
-                    'estimate_days': estimate_days,      # Keep as is for days
-                    'estimate_rate': estimate_rate,      # Keep as is for rate
-                    'estimate_total': estimate_total if isinstance(estimate_total, str) and estimate_total.startswith('$') else f"${estimate_total}" if estimate_total else None,
-                    'actual_total': actual_total if isinstance(actual_total, str) and actual_total.startswith('$') else f"${actual_total}" if actual_total else None
-                })
-                
-                # Don't validate days for percentage rates
-                if line_item.get('estimate_rate') and not line_item.get('estimate_days') and not str(line_item.get('estimate_rate')).endswith('%'):
-                    line_item.setdefault('validation_messages', []).append("Has estimate rate but missing days")
-            elif class_code == 'L':  # Class L has days and hours
-                # Get raw values first
-                estimate_days = row[2] if len(row) > 2 else None
-                estimate_rate = row[3] if len(row) > 3 else None
-                estimate_total = row[4] if len(row) > 4 else None
-                actual_hours = row[5] if len(row) > 5 else None
-                actual_total = row[6] if len(row) > 6 else None
-                
-                # Update line item with properly formatted values
-                line_item.update({
-                    'estimate_days': estimate_days,  # Keep as is for days
-                    'estimate_rate': estimate_rate,  # Keep as is for rate
-                    'estimate_total': estimate_total if isinstance(estimate_total, str) and estimate_total.startswith('$') else f"${estimate_total}" if estimate_total else None,
-                    'actual_hours': actual_hours,    # Keep as is for hours
-                    'actual_total': actual_total if isinstance(actual_total, str) and actual_total.startswith('$') else f"${actual_total}" if actual_total else None
-                })
-                
-                # Add class client total if available
-                if 'class_client_total' in class_totals:
-                    line_item['class_client_total'] = class_totals['class_client_total']
-                
-                # Validate days for Class L
-                if line_item.get('estimate_rate') and not line_item.get('estimate_days'):
-                    line_item.setdefault('validation_messages', []).append("Has estimate rate but missing days")
-            elif class_code == 'K':
-                line_item.update({
-                    'estimate_hours': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_total': row[4] if len(row) > 4 else None,
-                    'actual_hours': row[5] if len(row) > 5 else None,
-                    'actual_total': row[6] if len(row) > 6 else None
-                })
-            elif class_code == 'A':
-                line_item.update({
-                    'estimate_days': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_total': row[4] if len(row) > 4 else None,
-                    'actual_days': row[5] if len(row) > 5 else None,
-                    'actual_rate': row[6] if len(row) > 6 else None,
-                    'actual_total': row[7] if len(row) > 7 else None
-                })
-            elif class_code == 'B':
-                line_item.update({
-                    'estimate_days': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_ot_rate': row[4] if len(row) > 4 else None,
-                    'estimate_ot_hours': row[5] if len(row) > 5 else None,
-                    'estimate_total': row[6] if len(row) > 6 else None,
-                    'actual_days': row[7] if len(row) > 7 else None,
-                    'actual_rate': row[8] if len(row) > 8 else None,
-                    'actual_total': row[9] if len(row) > 9 else None
-                })
-            elif class_code in ['F', 'H']:  # Classes F and H have number, rate, total
-                line_item.update({
-                    'estimate_number': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_total': row[4] if len(row) > 4 else None,
-                    'actual_total': row[5] if len(row) > 5 else None
-                })
-            elif class_code == 'G':  # Class G has days, rate, total in estimate
-                line_item.update({
-                    'estimate_days': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_total': row[4] if len(row) > 4 else None,
-                    'actual_total': row[5] if len(row) > 5 else None
-                })
-            elif class_code == 'I':  # Class I has number, days, rate, total
-                line_item.update({
-                    'estimate_number': row[2] if len(row) > 2 else None,
-                    'estimate_days': row[3] if len(row) > 3 else None,
-                    'estimate_rate': row[4] if len(row) > 4 else None,
-                    'estimate_total': row[5] if len(row) > 5 else None,
-                    'actual_total': row[6] if len(row) > 6 else None
-                })
-            elif class_code == 'J':  # Class J has number, days, rate, total
-                line_item.update({
-                    'estimate_number': row[2] if len(row) > 2 else None,
-                    'estimate_days': row[3] if len(row) > 3 else None,
-                    'estimate_rate': row[4] if len(row) > 4 else None,
-                    'estimate_total': row[5] if len(row) > 5 else None,
-                    'actual_total': row[6] if len(row) > 6 else None
-                })
-            elif class_code == 'O':  # Class O has hours instead of days
-                line_item.update({
-                    'estimate_hours': row[2] if len(row) > 2 else None,
-                    'estimate_rate': row[3] if len(row) > 3 else None,
-                    'estimate_total': row[4] if len(row) > 4 else None,
-                    'actual_hours': row[5] if len(row) > 5 else None,
-                    'actual_total': row[6] if len(row) > 6 else None
-                })
-                # Add client total if available
-                if 'class_client_total' in class_totals:
-                    line_item['class_client_total'] = class_totals['class_client_total']
-            else:  # Classes C, D, E
-                line_item.update({
-                    'estimate_number': row[2] if len(row) > 2 else None,
-                    'estimate_days': row[3] if len(row) > 3 else None,
-                    'estimate_rate': row[4] if len(row) > 4 else None,
-                    'estimate_total': row[5] if len(row) > 5 else None,
-                    'actual_total': row[6] if len(row) > 6 else None
-                })
+            for field_name, index in _LINE_ITEM_COLUMNS.get(class_code, _DEFAULT_LINE_ITEM_COLUMNS):
+                line_item[field_name] = row[index] if len(row) > index else None
+
+            if class_code in _DOLLAR_PREFIXED_CLASSES:
+                line_item['estimate_total'] = _dollar_prefixed(line_item['estimate_total'])
+                line_item['actual_total'] = _dollar_prefixed(line_item['actual_total'])
+
+            # Classes L and O carry the class client total on every row
+            if class_code in ('L', 'O') and 'class_client_total' in class_totals:
+                line_item['class_client_total'] = format_money(class_totals['class_client_total'])
             
-            # Add class totals
-            line_item.update({
-                'class_estimate_subtotal': class_totals['class_estimate_subtotal'],
-                'class_estimate_pnw': class_totals.get('class_estimate_pnw', None),  # May be None for Class C-I
-                'class_estimate_total': class_totals['class_estimate_total'],
-                'class_actual_subtotal': class_totals['class_actual_subtotal'],
-                'class_actual_pnw': class_totals.get('class_actual_pnw', None),  # May be None for Class C-I
-                'class_actual_total': class_totals['class_actual_total']
-            })
+            # Class totals are shared by reference across every row of the class;
+            # they are flattened into class_* fields when the item is serialized
+            line_item['class_totals'] = class_totals
             
             # Validate line item
             validation_messages = self._validate_line_item(line_item, class_code, row_number)
@@ -1006,14 +1034,15 @@ class BudgetProcessor:
             line_item['validation_messages'] = validation_messages
             
             # Log empty or unusual values
-            for key, value in line_item.items():
-                if key not in ['validation_status', 'validation_messages'] and value in [None, '', '$0.00', '0', 0]:
-                    logger.debug(f"Empty or zero value for {key} in row {row_number}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for key, value in line_item.items():
+                    if key not in _EMPTY_CHECK_SKIP_KEYS and value in _EMPTY_VALUES:
+                        logger.debug("Empty or zero value for %s in row %s", key, row_number)
             
             return line_item
             
-        except Exception as e:
-            logger.error(f"Error processing row {row_number}: {str(e)}")
+        except (IndexError, KeyError, TypeError, AttributeError) as e:
+            logger.error("Error processing row %s: %s", row_number, e)
             return None
 
     def _get_class_name(self, header_values: list, class_code: str, mapping: dict, spreadsheet_id: str, sheet_title: str) -> Optional[str]:
@@ -1029,7 +1058,7 @@ class BudgetProcessor:
         header_text = header_values[0][0] if header_values[0] else ""
         if header_text.startswith(f"{class_code}:"):
             # Extract name part after the class code
-            return header_text.split(":", 1)[1].strip()
+            return header_text.partition(":")[2].strip()
             
         # If still not found, try reading name cell directly
         name_range = f"'{sheet_title}'!{mapping['class_name_cell']}"
@@ -1039,27 +1068,18 @@ class BudgetProcessor:
             
         return None
 
-    def _batch_get_values(self, spreadsheet_id: str, ranges: List[str], sheet_title: str) -> Dict[str, List]:
-        """Fetch multiple cell ranges in a batch request to reduce API calls."""
+    def _batch_get_values(self, spreadsheet_id: str, ranges: List[str]) -> Dict[str, List]:
+        """Fetch multiple sheet-qualified ranges (e.g. "'Budget'!C5") in a batch request to reduce API calls."""
         max_retries = 5
         base_delay = 2
-        
-        budget_name = sheet_title if sheet_title else "Fallback_Sheet_Name"
-        formatted_ranges = []
-        for cell in ranges:
-            if '!' in cell:
-                formatted_ranges.append(cell)
-            else:
-                formatted_ranges.append(f"'{budget_name}'!{cell}")
 
-        logger.debug(f"Batch request using sheet_title: {sheet_title}")
-        logger.debug(f"Ranges requested: {formatted_ranges}")
+        logger.debug("Ranges requested: %s", ranges)
         
         for attempt in range(max_retries):
             try:
                 result = self.sheets_service.spreadsheets().values().batchGet(
                     spreadsheetId=spreadsheet_id,
-                    ranges=formatted_ranges
+                    ranges=ranges
                 ).execute()
                 
                 return {
@@ -1067,36 +1087,39 @@ class BudgetProcessor:
                     for entry in result.get('valueRanges', [])
                 }
             except Exception as e:
-                if 'RATE_LIMIT_EXCEEDED' in str(e) and attempt < max_retries - 1:
-                    delay = base_delay * (2 ** attempt)
-                    logger.warning(f"🚫 Rate limit exceeded for batch request")
-                    logger.warning(f"⏳ Attempt {attempt + 1}/{max_retries}: Waiting {delay} seconds")
-                    logger.debug(f"Requested {len(formatted_ranges)} ranges: {formatted_ranges}")
+                if is_rate_limited(e) and attempt < max_retries - 1:
+                    delay = retry_delay(e, base_delay * (2 ** attempt))
+                    logger.warning("🚫 Rate limit exceeded for batch request")
+                    logger.warning("⏳ Attempt %s/%s: Waiting %.1f seconds", attempt + 1, max_retries, delay)
+                    logger.debug("Requested %s ranges: %s", len(ranges), ranges)
                     time.sleep(delay)
-                    logger.info(f"▶️ Resuming after {delay}s wait")
+                    logger.info("▶️ Resuming after %.1fs wait", delay)
                     continue
-                logger.error(f"Error in batch request: {str(e)}")
+                logger.error("Error in batch request: %s", e)
                 raise
 
-    def _process_cover_sheet(self, spreadsheet_id: str, sheet_title: str) -> Dict:
-        """Process Cover Sheet data by delegating to the cover_sheet_processor module."""
-        logger.info(f"[Cover_Sheet] Processing cover sheet for sheet: {sheet_title}")
-        processed_data = process_cover_sheet(self.sheets_service, spreadsheet_id, sheet_title)
-        logger.info(f"[Cover_Sheet] Processed cover sheet data: {processed_data}")
-        return processed_data
+    def _process_cover_sheet(self, spreadsheet_id: str, sheet_title: str, own_client: bool = False) -> Dict:
+        """Process Cover Sheet data by delegating to the cover_sheet_processor module.
 
-    def _format_money(self, value: Any) -> str:
-        """Format number as money string."""
-        if value is None:
-            return "$0.00"
-        try:
-            if isinstance(value, str):
-                if value.startswith('$'):
-                    return value  # Already formatted
-                value = float(value.replace(',', ''))  # Convert to float safely
-            return "${:,.2f}".format(float(value))  # Format as currency
-        except (ValueError, TypeError):
-            return "$0.00"  # Default if formatting fails
+        Set ``own_client`` when calling from a worker thread; a separate Sheets client is then
+        built only on a cache miss, since the shared one is not thread-safe. Results are
+        cached per (spreadsheet_id, sheet_title) for the lifetime of the processor; callers
+        always get their own copy, since validation fills in and converts fields in place.
+        """
+        cache_key = (spreadsheet_id, sheet_title)
+        if cache_key in self._cover_sheet_cache:
+            return copy.deepcopy(self._cover_sheet_cache[cache_key])
+
+        logger.info("[Cover_Sheet] Processing cover sheet for sheet: %s", sheet_title)
+        sheets_service = (
+            build('sheets', 'v4', credentials=self._creds, cache_discovery=False)
+            if own_client else self.sheets_service
+        )
+        processed_data = process_cover_sheet(sheets_service, spreadsheet_id, sheet_title)
+        logger.info("[Cover_Sheet] Processed cover sheet data: %s", processed_data)
+        if processed_data:
+            self._cover_sheet_cache[cache_key] = copy.deepcopy(processed_data)
+        return processed_data
 
     def _validate_cover_sheet(self, cover_sheet_data: Dict, spreadsheet_title: str) -> Dict:
         """Validates the cover sheet data and applies fallback defaults."""
@@ -1129,58 +1152,71 @@ class BudgetProcessor:
             mapping = self.CLASS_MAPPINGS['COVER_SHEET']
 
             # Build list of ranges - using project_info cells as example
-            ranges_to_fetch = []
-            for cell in mapping['project_info'].values():
-                ranges_to_fetch.append(f"'{sheet_title}'!{cell}")
+            prefix = f"'{sheet_title}'!"
+            ranges_to_fetch = [prefix + cell for cell in mapping['project_info'].values()]
 
-            logger.info(f"Fetching raw data with ranges: {ranges_to_fetch}")
-            raw_data = self._batch_get_values(self.spreadsheet_id, ranges_to_fetch, sheet_title)
-            logger.info(f"Raw data retrieved: {raw_data}")
+            logger.info("Fetching raw data with ranges: %s", ranges_to_fetch)
+            raw_data = self._batch_get_values(self.spreadsheet_id, ranges_to_fetch)
+            logger.info("Raw data retrieved: %s", raw_data)
             return raw_data
         except Exception as e:
-            logger.error(f"Error fetching raw data: {str(e)}")
+            logger.error("Error fetching raw data: %s", e)
             return {}
 
+    def _sheet_rows(self, spreadsheet_id: str, sheet_title: str) -> Tuple[List[Dict], Dict]:
+        """Process every budget class of a sheet into flat line item rows.
+
+        Returns ``(rows, processing_summary)``. Rows are flattened for serialization: the shared
+        class totals become flat class_* fields.
+        """
+        rows = []
+        processed_classes = set()
+        validation_issues = 0
+
+        # Fetch every class's ranges up front in one batch request
+        fetched = self._fetch_class_ranges(spreadsheet_id, sheet_title)
+
+        # Process each budget class
+        for class_code, class_info in _CLASS_ITEMS:
+            logger.info("🔄 Processing Class %s...", class_code)
+
+            # Process class data
+            class_data = self._process_class(spreadsheet_id, sheet_title, class_code, class_info, fetched[class_code])
+
+            if class_data:
+                for row in class_data.line_items:
+                    row.setdefault('class_code', class_code)
+                    processed_classes.add(row['class_code'])
+                    if row['validation_status'] != 'valid':
+                        validation_issues += 1
+                    rows.append(flatten_line_item(row))
+
+        return rows, {
+            'total_rows': len(rows),
+            'processed_classes': sorted(processed_classes),
+            'validation_issues': validation_issues
+        }
+
     def process_sheet(self, spreadsheet_id: str, sheet_gid: str) -> Tuple[List[Dict], Dict]:
         """Process a single sheet from the spreadsheet."""
         try:
-            processed_rows = []
-            processed_classes = 0
-            pause_time = 10  # Reduced from 30 to 10 seconds
-            
             # Get sheet title
-            sheet_title = self._get_sheet_title(spreadsheet_id, sheet_gid)
+            sheet_title = self._get_sheet_info(spreadsheet_id, sheet_gid)['title']
             
-            # Process each budget class
-            for class_code, class_info in self.CLASS_MAPPINGS.items():
-                logger.info(f"🔄 Processing Class {class_code}...")
-                
-                # Process class data
-                class_rows = self._process_class(
-                    spreadsheet_id,
-                    sheet_gid,
-                    sheet_title,
-                    class_code,
-                    class_info
-                )
-                processed_rows.extend(class_rows)
-                processed_classes += 1
-                
-                # Pause after every 2 classes to avoid rate limits
-                if processed_classes % 2 == 0:
-                    logger.info(f"⏳ Pausing for {pause_time}s after processing {processed_classes} classes...")
-                    for i in range(pause_time, 0, -1):
-                        logger.info(f"⌛ Resuming in {i} seconds...")
-                        time.sleep(1)
+            processed_rows, processing_summary = self._sheet_rows(spreadsheet_id, sheet_title)
             
             # Get version info
-            clean_file = '_'.join(''.join(c if c.isalnum() else ' ' for c in sheet_title).split())
-            date_str = datetime.now(timezone.utc).strftime('%m-%d-%y')
+            clean_file = _clean_name(sheet_title)
+            now = datetime.now(timezone.utc)
+            date_str = now.strftime('%m-%d-%y')
             
             # Get version numbers
-            major, minor, patch = self._get_version_numbers(clean_file, sheet_title, date_str, {})
+            major, minor, patch = self._cached_version(clean_file, sheet_title, date_str)
             version_str = f"{major}.{minor}.{patch}"
             
+            # Fetch the cover sheet once for all metadata sections
+            cover_sheet = self._process_cover_sheet(spreadsheet_id, sheet_title)
+            
             # Generate metadata with reorganized structure
             metadata = {
                 'upload_info': {
@@ -1189,42 +1225,35 @@ class BudgetProcessor:
                     'spreadsheet_title': sheet_title,
                     'sheet_title': sheet_title,
                     'sheet_gid': sheet_gid,
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'timestamp': now.isoformat(),
                     'version': version_str,
-                    'first_seen': self._get_first_seen_date(clean_file, sheet_title),
+                    'first_seen': self._get_first_seen_date(clean_file, sheet_title, date_str),
                     'last_updated': date_str
                 },
                 'metadata': {
-                    'project_info': self._process_cover_sheet(spreadsheet_id, sheet_title)['project_summary']['project_info'],
-                    'core_team': self._process_cover_sheet(spreadsheet_id, sheet_title)['project_summary']['core_team'],
-                    'timeline': self._process_cover_sheet(spreadsheet_id, sheet_title)['project_summary']['timeline'],
-                    'financials': self._process_cover_sheet(spreadsheet_id, sheet_title)['financials']
+                    'project_info': cover_sheet['project_summary']['project_info'],
+                    'core_team': cover_sheet['project_summary']['core_team'],
+                    'timeline': cover_sheet['project_summary']['timeline'],
+                    'financials': cover_sheet['financials']
                 },
-                'processing_summary': {
-                    'total_rows': len(processed_rows),
-                    'processed_classes': sorted(list(set(r['class_code'] for r in processed_rows))),
-                    'validation_issues': sum(1 for r in processed_rows if r['validation_status'] != 'valid')
-                }
+                'processing_summary': processing_summary
             }
             
+            self.flush_version_tracking()
             return processed_rows, metadata
             
         except Exception as e:
-            logger.error(f"Error processing sheet: {str(e)}")
+            logger.error("Error processing sheet: %s", e)
             raise
 
-    def _get_first_seen_date(self, clean_file: str, clean_sheet: str) -> str:
-        """Get the first seen date for a file/sheet combination."""
-        try:
-            with open('output/version_tracking.json', 'r') as f:
-                tracking_data = json.load(f)
-                
-            key = f"{clean_file}-{clean_sheet}"
-            if key in tracking_data:
-                return tracking_data[key].get('first_seen', datetime.now(timezone.utc).strftime('%m-%d-%y'))
-            return datetime.now(timezone.utc).strftime('%m-%d-%y')
-        except:
-            return datetime.now(timezone.utc).strftime('%m-%d-%y')
+    def _get_first_seen_date(self, clean_file: str, clean_sheet: str, today: Optional[str] = None) -> str:
+        """Get the first seen date for a file/sheet combination, defaulting to ``today`` (MM-DD-YY)."""
+        if today is None:
+            today = datetime.now(timezone.utc).strftime('%m-%d-%y')
+        entry = self._load_version_tracking().get(f"{clean_file}-{clean_sheet}")
+        if isinstance(entry, dict):
+            return entry.get('first_seen', today)
+        return today
 
     def _get_range_values(self, spreadsheet_id: str, range_name: str) -> list:
         """Fetch values for a specific range with retry logic."""
@@ -1239,13 +1268,13 @@ class BudgetProcessor:
                 ).execute()
                 return result.get('values', [])
             except Exception as e:
-                if 'RATE_LIMIT_EXCEEDED' in str(e):
+                if is_rate_limited(e):
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s, 16s, 32s
-                        logger.warning(f"🚫 Rate limit exceeded for range {range_name}")
-                        logger.warning(f"⏳ Attempt {attempt + 1}/{max_retries}: Waiting {delay} seconds")
+                        delay = retry_delay(e, base_delay * (2 ** attempt))  # Exponential backoff from 2s to 32s, plus jitter
+                        logger.warning("🚫 Rate limit exceeded for range %s", range_name)
+                        logger.warning("⏳ Attempt %s/%s: Waiting %.1f seconds", attempt + 1, max_retries, delay)
                         time.sleep(delay)
-                        logger.info(f"▶️ Resuming after {delay}s wait")
+                        logger.info("▶️ Resuming after %.1fs wait", delay)
                         continue
                 raise
 
@@ -1268,44 +1297,58 @@ class BudgetProcessor:
                 return values
                 
             except Exception as e:
-                if 'RATE_LIMIT_EXCEEDED' in str(e):
+                if is_rate_limited(e):
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
-                        logger.warning(f"🚫 Rate limit exceeded for batch request of {len(ranges)} ranges")
-                        logger.warning(f"⏳ Attempt {attempt + 1}/{max_retries}: Waiting {delay} seconds")
-                        logger.debug(f"Affected ranges: {ranges}")
+                        delay = retry_delay(e, base_delay * (2 ** attempt))
+                        logger.warning("🚫 Rate limit exceeded for batch request of %s ranges", len(ranges))
+                        logger.warning("⏳ Attempt %s/%s: Waiting %.1f seconds", attempt + 1, max_retries, delay)
+                        logger.debug("Affected ranges: %s", ranges)
                         time.sleep(delay)
-                        logger.info(f"▶️ Resuming after {delay}s wait")
+                        logger.info("▶️ Resuming after %.1fs wait", delay)
                         continue
-                logger.error(f"Error in batch request: {str(e)}")
+                logger.error("Error in batch request: %s", e)
                 raise
             
     def _get_sheet_info(self, spreadsheet_id: str, gid: str) -> Dict[str, str]:
-        """Get sheet information including title."""
+        """Get sheet information including title.
+
+        Results are cached per (spreadsheet_id, gid) for the lifetime of the processor,
+        so repeated lookups during one run do not re-fetch spreadsheet metadata.
+        """
+        cache_key = (spreadsheet_id, str(gid))
+        if cache_key in self._sheet_info_cache:
+            return self._sheet_info_cache[cache_key]
+
         try:
-            logger.info(f"Fetching sheet metadata for spreadsheet {spreadsheet_id} and GID {gid}")
+            logger.info("Fetching sheet metadata for spreadsheet %s and GID %s", spreadsheet_id, gid)
             response = self.sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
             
             sheets = response.get("sheets", [])
+            sheet_info = None
             for sheet in sheets:
                 if str(sheet["properties"]["sheetId"]) == str(gid):
-                    logger.info(f"✅ Found sheet title: {sheet['properties']['title']}")
-                    return {
+                    logger.info("✅ Found sheet title: %s", sheet['properties']['title'])
+                    sheet_info = {
                         "spreadsheet_title": response.get("properties", {}).get("title", "Unknown Spreadsheet"),
                         "title": sheet["properties"]["title"],
                         "gid": gid
                     }
+                    break
+
+            if sheet_info is None:
+                # If we get here, no matching sheet was found
+                logger.warning("⚠️ No sheet found for GID %s, defaulting to unknown", gid)
+                sheet_info = {
+                    "spreadsheet_title": response.get("properties", {}).get("title", "Unknown Spreadsheet"),
+                    "title": f"Sheet_{gid}",
+                    "gid": gid
+                }
 
-            # If we get here, no matching sheet was found
-            logger.warning(f"⚠️ No sheet found for GID {gid}, defaulting to unknown")
-            return {
-                "spreadsheet_title": response.get("properties", {}).get("title", "Unknown Spreadsheet"),
-                "title": f"Sheet_{gid}",
-                "gid": gid
-            }
+            self._sheet_info_cache[cache_key] = sheet_info
+            return sheet_info
 
         except Exception as e:
-            logger.error(f"❌ Error fetching sheet metadata: {str(e)}")
+            logger.error("❌ Error fetching sheet metadata: %s", e)
             raise ValueError(f"Failed to access sheet: {str(e)}")
 
     def _get_cell_value(self, spreadsheet_id: str, sheet_title: str, cell_ref: str) -> Any:
@@ -1319,110 +1362,105 @@ class BudgetProcessor:
             values = result.get('values', [])
             return values[0][0] if values and values[0] else None
         except Exception as e:
-            logging.warning(f"Error getting cell {cell_ref}: {str(e)}")
+            logger.warning("Error getting cell %s: %s", cell_ref, e)
             return None
 
-    def _process_class(self, spreadsheet_id: str, sheet_title: str, class_code: str, mapping: Dict) -> Optional[BudgetClass]:
-        """Process a single class section and return a BudgetClass object."""
+    def _process_class(self, spreadsheet_id: str, sheet_title: str, class_code: str, mapping: Dict,
+                       fetched: Optional[Dict[str, List]] = None) -> Optional[BudgetClass]:
+        """Process a single class section and return a BudgetClass object.
+
+        ``fetched`` holds the class's values from ``_fetch_class_ranges``; if omitted they are fetched here.
+        """
+        if fetched is None:
+            fetched = self._fetch_class_ranges(spreadsheet_id, sheet_title, [class_code])[class_code]
+
         # Get class header
-        header_range = f"'{sheet_title}'!{mapping['class_code_cell']}:{mapping['class_name_cell']}"
-        header_values = self._get_range_values(spreadsheet_id, header_range)
+        header_values = fetched['header']
         
         # Debug header values
-        logger.debug(f"Class {class_code} header range: {header_range}")
-        logger.debug(f"Class {class_code} header values: {header_values}")
+        logger.debug("Class %s header values: %s", class_code, header_values)
         
         if not header_values:
-            logger.warning(f"⚠️ No header values found for class {class_code}, skipping...")
+            logger.warning("⚠️ No header values found for class %s, skipping...", class_code)
             return None
         
         # Get class name
         class_name = self._get_class_name(header_values, class_code, mapping, spreadsheet_id, sheet_title)
         if not class_name:
-            logger.warning(f"⚠️ No class name found for class {class_code}, skipping...")
+            logger.warning("⚠️ No class name found for class %s, skipping...", class_code)
             return None
+
+        # Clean class name once per class - remove class code prefix if present
+        _, sep, name_part = class_name.partition(':')
+        if sep:
+            class_name = name_part.strip()
             
         # Get all data including calculated totals
-        data_range = f"'{sheet_title}'!{mapping['line_items_range']['start']}:{mapping['line_items_range']['end']}"
-        starting_row = self._extract_row_from_cell(mapping['line_items_range']['start'])
-        logger.debug(f"Class {class_code} starting row from mapping: {starting_row}")
-        data_values = self._get_range_values(spreadsheet_id, data_range)
-        logger.debug(f"Class {class_code} data range: {data_range} retrieved {len(data_values)} rows")
+        data_values = fetched['line_items']
+        logger.debug("Class %s retrieved %s rows", class_code, len(data_values))
         
         if not data_values:
-            logger.warning(f"⚠️ No data values found for class {class_code}, skipping...")
+            logger.warning("⚠️ No data values found for class %s, skipping...", class_code)
             return None
         
         # Get totals directly from cells
-        class_totals = self._get_class_totals(spreadsheet_id, sheet_title, mapping)
-        logger.debug(f"Class {class_code} totals: {class_totals}")
+        class_totals = self._get_class_totals(fetched)
+        logger.debug("Class %s totals: %s", class_code, class_totals)
         
+        # Keep only rows with both a line number and a description
+        candidate_rows = [
+            (row_number, row)
+            for row_number, row in enumerate(data_values, start=1)
+            if len(row) >= 2 and row[0] and row[1]
+        ]
+        logger.debug("Class %s: %s of %s rows have a line number and description", class_code, len(candidate_rows), len(data_values))
+
         line_items = []
         # Process each line item
-        for row_number, row in enumerate(data_values, start=1):
-            if not row:  # Skip empty rows
-                continue
-                
-            if len(row) < 2:  # Need at least number and description
-                logger.debug(f"Skipping incomplete row {row_number} in class {class_code}")
-                continue
-                
+        for row_number, row in candidate_rows:
             # Process line item with class totals
-            line_item = self._process_line_item(row, class_code, class_name, class_totals, row_number)
+            line_item = self._process_line_item(row, class_code, class_totals, row_number)
             if line_item:
                 line_items.append(line_item)
         
         if not line_items:
-            logger.warning(f"⚠️ Class {class_code} has no valid line items, skipping...")
+            logger.warning("⚠️ Class %s has no valid line items, skipping...", class_code)
             return None
 
-        def clean_money_value(value: str) -> float:
-            """Convert money or percentage string to float."""
-            if not value:
-                return 0.0
-            try:
-                # Handle percentage values
-                if isinstance(value, str):
-                    # Remove $ if present (some percentage cells might have $ prefix)
-                    value = value.replace('$', '')
-                    
-                    if value.endswith('%'):
-                        # Convert percentage to decimal (e.g., "28%" -> 0.28)
-                        return float(value.rstrip('%')) / 100
-                    
-                    # Handle regular money values
-                    return float(value.replace(',', ''))
-                    
-                return float(value)
-            except (ValueError, TypeError):
-                logger.warning(f"Could not convert value '{value}' to float, using 0.0")
-                return 0.0
-            
-        # Create BudgetClass object with cleaned values
+        # Create BudgetClass object from the parsed totals
         return BudgetClass(
             class_code=class_code,
             class_name=class_name,
-            estimate_subtotal=clean_money_value(class_totals['class_estimate_subtotal']),
-            estimate_pnw=clean_money_value(class_totals.get('class_estimate_pnw', '0')),
-            estimate_total=clean_money_value(class_totals['class_estimate_total']),
-            actual_subtotal=clean_money_value(class_totals['class_actual_subtotal']),
-            actual_pnw=clean_money_value(class_totals.get('class_actual_pnw', '0')),
-            actual_total=clean_money_value(class_totals['class_actual_total']),
+            estimate_subtotal=class_totals['class_estimate_subtotal'],
+            estimate_pnw=class_totals['class_estimate_pnw'] or 0.0,
+            estimate_total=class_totals['class_estimate_total'],
+            actual_subtotal=class_totals['class_actual_subtotal'],
+            actual_pnw=class_totals['class_actual_pnw'] or 0.0,
+            actual_total=class_totals['class_actual_total'],
             line_items=line_items
         )
 
     def process_budget(self) -> Optional[Dict]:
         """Process budget with enhanced validation and error handling."""
         try:
-            logger.info(f"Processing budget from sheet {self.spreadsheet_id}")
+            logger.info("Processing budget from sheet %s", self.spreadsheet_id)
             try:
                 sheet_info = self._get_sheet_info(self.spreadsheet_id, self.gid)
             except ValueError as e:
-                logger.error(f"Failed to get sheet info: {str(e)}")
+                logger.error("Failed to get sheet info: %s", e)
                 return None
 
             try:
-                cover_sheet_data = self._process_cover_sheet(self.spreadsheet_id, sheet_info['title'])
+                # The cover sheet and class ranges are independent reads, so fetch them concurrently.
+                # httplib2 connections are not thread-safe, so on a cache miss the worker builds
+                # its own Sheets client.
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    cover_future = executor.submit(
+                        self._process_cover_sheet, self.spreadsheet_id, sheet_info['title'], own_client=True
+                    )
+                    fetched = self._fetch_class_ranges(self.spreadsheet_id, sheet_info['title'])
+                    cover_sheet_data = cover_future.result()
+
                 if not cover_sheet_data:
                     logger.warning("⚠️ cover_sheet_data is empty! Using default values.")
                     cover_sheet_data = {}
@@ -1435,67 +1473,72 @@ class BudgetProcessor:
                 logger.info("✓ Cover sheet processed successfully")
 
                 classes = {}
-                logger.info(f"Starting to process budget classes...")
-                logger.info(f"Found {len([k for k in self.CLASS_MAPPINGS.keys() if k != 'COVER_SHEET'])} classes to process")
-
-                for class_code, mapping in self.CLASS_MAPPINGS.items():
-                    if class_code == 'COVER_SHEET':
-                        continue
+                total_rows = 0
+                validation_issues = 0
+                logger.info("Starting to process budget classes...")
+                logger.info("Found %s classes to process", len(_CLASS_ITEMS))
 
+                for class_code, mapping in _CLASS_ITEMS:
                     try:
-                        logger.info(f"🔍 Processing budget class: {class_code}...")
-                        logger.debug(f"Using mapping: {json.dumps(mapping, indent=2)}")
+                        logger.info("🔍 Processing budget class: %s...", class_code)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Using mapping: %s", json.dumps(mapping, indent=2))
 
-                        header_range = f"'{sheet_info['title']}'!{mapping['class_code_cell']}:{mapping['class_name_cell']}"
-                        header_values = self._get_range_values(self.spreadsheet_id, header_range)
+                        header_values = fetched[class_code]['header']
 
                         if not header_values:
-                            logger.info(f"⚠️ Class {class_code} header not found at {header_range}, skipping.")
+                            logger.info("⚠️ Class %s header not found at %s:%s, skipping.", class_code, mapping['class_code_cell'], mapping['class_name_cell'])
                             continue
 
-                        logger.info(f"Found class header: {header_values}")
+                        logger.info("Found class header: %s", header_values)
 
-                        class_data = self._process_class(self.spreadsheet_id, sheet_info['title'], class_code, mapping)
+                        class_data = self._process_class(self.spreadsheet_id, sheet_info['title'], class_code, mapping, fetched[class_code])
 
                         if class_data:
                             classes[class_code] = class_data
-                            logger.info(f"✅ Successfully processed class {class_code}")
+                            logger.info("✅ Successfully processed class %s", class_code)
                             if hasattr(class_data, 'line_items'):
-                                logger.info(f"   Found {len(class_data.line_items)} line items")
+                                logger.info("   Found %s line items", len(class_data.line_items))
+                                # Tally the processing summary while the class is at hand
+                                total_rows += len(class_data.line_items)
+                                for line_item in class_data.line_items:
+                                    if line_item.get('validation_status') != 'valid':
+                                        validation_issues += 1
                         else:
-                            logger.warning(f"⚠️ Class {class_code} returned no data")
+                            logger.warning("⚠️ Class %s returned no data", class_code)
 
                     except Exception as e:
-                        logger.error(f"❌ Error processing class {class_code}: {str(e)}")
-                        import traceback
-                        logger.error(f"Traceback: {traceback.format_exc()}")
+                        logger.exception("❌ Error processing class %s: %s", class_code, e)
 
-                logger.info(f"Completed class processing. Found {len(classes)} valid classes.")
+                logger.info("Completed class processing. Found %s valid classes.", len(classes))
 
-                # Combine all data
+                # Combine all data, stamped with a single clock reading
+                now = datetime.now(timezone.utc)
                 budget_data = {
-                    'upload_id': self._generate_upload_id(sheet_info['spreadsheet_title'], sheet_info['title']),
-                    'upload_timestamp': datetime.now(timezone.utc).isoformat(),
+                    'upload_id': self._generate_upload_id(sheet_info['spreadsheet_title'], sheet_info['title'], now),
+                    'upload_timestamp': now.isoformat(),
                     'version_status': 'draft',
                     'sheet_title': sheet_info['title'],
                     'project_summary': validated_data.get('project_summary', {}),
                     'financials': validated_data.get('financials', {}),
                     'classes': classes,
                     'processing_summary': {
-                        'total_rows': sum(len(c.line_items) for c in classes.values() if hasattr(c, 'line_items')),
+                        'total_rows': total_rows,
                         'processed_classes': list(classes.keys()),
-                        'validation_issues': sum(1 for c in classes.values() for li in getattr(c, 'line_items', []) if li.get('validation_status') != 'valid')
+                        'validation_issues': validation_issues
                     }
                 }
-                logger.info("Final merged budget data: " + json.dumps(budget_data, indent=2, default=str))
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Final merged budget data: %s", json.dumps(budget_data, indent=2, default=str))
+                self.flush_version_tracking()
                 return budget_data
 
             except ValueError as e:
-                logger.error(f"❌ Cover sheet validation failed: {str(e)}")
+                logger.error("❌ Cover sheet validation failed: %s", e)
                 return None
 
         except Exception as e:
-            logger.error(f"❌ Unexpected error: {str(e)}")
+            logger.error("❌ Unexpected error: %s", e)
             return None
 
     def validate_and_transform_budget(self, budget_data: Dict) -> Dict:
@@ -1510,13 +1553,13 @@ class BudgetProcessor:
             try:
                 budget_data["upload_timestamp"] = upload_timestamp.isoformat()
             except Exception as e:
-                logger.warning(f"Error formatting upload_timestamp: {e}")
+                logger.warning("Error formatting upload_timestamp: %s", e)
                 budget_data["upload_timestamp"] = datetime.now(timezone.utc).isoformat()
 
         def convert_money(value):
             try:
                 if isinstance(value, str):
-                    value = value.replace('$', '').replace(',', '')
+                    value = value.translate(_MONEY_STRIP)
                 return float(value)
             except Exception:
                 return 0.0
@@ -1547,7 +1590,9 @@ class BudgetProcessor:
 
         classes = budget_data.get("classes", {})
         for key, budget_class in classes.items():
-            if hasattr(budget_class, "__dataclass_fields__"):
+            if hasattr(budget_class, "to_dict"):
+                final_json["classes"][key] = budget_class.to_dict()
+            elif hasattr(budget_class, "__dataclass_fields__"):
                 from dataclasses import asdict
                 final_json["classes"][key] = asdict(budget_class)
             elif hasattr(budget_class, "__dict__"):
@@ -1571,7 +1616,7 @@ class BudgetProcessor:
         try:
             bq_client = self.bigquery_service if self.bigquery_service is not None else bigquery.Client()
         except Exception as e:
-            logger.error(f"Error initializing BigQuery client: {e}")
+            logger.error("Error initializing BigQuery client: %s", e)
             return False
         
         dataset_id = os.environ.get('BIGQUERY_DATASET_ID')
@@ -1593,16 +1638,38 @@ class BudgetProcessor:
             logger.error("Failed to upload budget data to BigQuery.")
             return False
 
+
+# Budget class mappings in sheet order, without the cover sheet entry
+_CLASS_ITEMS = tuple(
+    (class_code, mapping)
+    for class_code, mapping in BudgetProcessor.CLASS_MAPPINGS.items()
+    if class_code != 'COVER_SHEET'
+)
+
+# Per-class cell ranges, precomputed once from the static CLASS_MAPPINGS
+_CLASS_CELLS = {class_code: _class_cells(mapping) for class_code, mapping in _CLASS_ITEMS}
+
+# Per-class line item validators, built once from the required fields in CLASS_MAPPINGS
+_LINE_ITEM_VALIDATORS = {
+    class_code: _make_line_item_validator(class_code, mapping['required_fields'])
+    for class_code, mapping in _CLASS_ITEMS
+}
+
+
 def retry_on_http_error(max_retries=5, backoff_factor=2, status_codes=(429, 503)):
     """Decorator to retry a function on specific HTTP errors with exponential backoff.
 
+    The wait honours the server's Retry-After header when present and adds
+    random jitter so concurrent workers sharing a quota don't retry in lockstep.
+
     Args:
         max_retries: Maximum number of retries.
         backoff_factor: Factor for exponential backoff.
         status_codes: Tuple of HTTP status codes to retry on.
 
     Returns:
-        Decorated function with retry logic.
+        Decorated function with retry logic. The last HttpError is re-raised
+        once retries are exhausted.
     """
     def decorator(func):
         def wrapper(*args, **kwargs):
@@ -1610,15 +1677,15 @@ def retry_on_http_error(max_retries=5, backoff_factor=2, status_codes=(429, 503)
                 try:
                     return func(*args, **kwargs)
                 except HttpError as error:
-                    if error.resp.status in status_codes:
-                        wait_time = backoff_factor ** attempt
-                        logger.warning(f"HTTP error {error.resp.status} occurred. Retrying in {wait_time} seconds...")
-                        time.sleep(wait_time)
-                    else:
-                        logger.error(f"HttpError occurred: {error}")
+                    if error.resp.status not in status_codes:
+                        logger.error("HttpError occurred: %s", error)
                         raise
-            logger.error("Max retries exceeded.")
-            return None
+                    if attempt == max_retries - 1:
+                        logger.error("Max retries exceeded.")
+                        raise
+                    wait_time = retry_delay(error, backoff_factor ** attempt)
+                    logger.warning("HTTP error %s occurred. Retrying in %.1f seconds...", error.resp.status, wait_time)
+                    time.sleep(wait_time)
         return wrapper
     return decorator
 
@@ -1,9 +1,9 @@
-import os
 import logging
 from typing import Dict, Any
 from datetime import datetime
 from .google_drive_service import GoogleDriveService
 from .google_sheets_service import GoogleSheetsService
+from ..utils.env import require_env
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +14,9 @@ class BudgetTemplateService:
         self.drive = GoogleDriveService()
         self.sheets = GoogleSheetsService()
         
-        self.template_id = os.getenv('GOOGLE_SHEETS_TEMPLATE_ID')
-        if not self.template_id:
-            raise ValueError("GOOGLE_SHEETS_TEMPLATE_ID environment variable is required")
-            
-        self.bids_root_id = os.getenv('GOOGLE_BIDS_ROOT_ID')
-        if not self.bids_root_id:
-            raise ValueError("GOOGLE_BIDS_ROOT_ID environment variable is required")
-            
-        self.workspace_domain = os.getenv('GOOGLE_WORKSPACE_DOMAIN')
-        if not self.workspace_domain:
-            raise ValueError("GOOGLE_WORKSPACE_DOMAIN environment variable is required")
+        self.template_id = require_env('GOOGLE_SHEETS_TEMPLATE_ID')
+        self.bids_root_id = require_env('GOOGLE_BIDS_ROOT_ID')
+        self.workspace_domain = require_env('GOOGLE_WORKSPACE_DOMAIN')
     
     def setup_budget(self, task_id: str, client_name: str, job_name: str) -> Dict[str, Any]:
         """Set up budget template and folder structure."""
@@ -1,8 +1,8 @@
-import os
 import logging
 from typing import Dict, Any, Optional
 import requests
 from dotenv import load_dotenv
+from ..utils.env import require_env
 
 load_dotenv()
 
@@ -12,21 +12,22 @@ class ClickupService:
     """Service for interacting with Clickup API."""
     
     def __init__(self):
-        self.api_key = os.getenv('CLICKUP_API_KEY')
-        if not self.api_key:
-            raise ValueError("CLICKUP_API_KEY environment variable is required")
+        self.api_key = require_env('CLICKUP_API_KEY')
         self.base_url = "https://api.clickup.com/api/v2"
         self.headers = {
             "Authorization": self.api_key,
             "Content-Type": "application/json"
         }
+        # Reuse one keep-alive connection pool for every request to the Clickup API
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def create_folder(self, list_id: str, name: str) -> Dict[str, Any]:
         """Create a new folder in a Clickup list."""
         url = f"{self.base_url}/list/{list_id}/folder"
         payload = {"name": name}
         
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
         return response.json()
     
@@ -35,7 +36,7 @@ class ClickupService:
         url = f"{self.base_url}/folder/{folder_id}/list"
         payload = {"name": name}
         
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
         return response.json()
     
@@ -44,7 +45,7 @@ class ClickupService:
         url = f"{self.base_url}/task/{task_id}/field/{field_id}"
         payload = {"value": value}
         
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
         return response.json()
     
@@ -52,7 +53,7 @@ class ClickupService:
         """Get task details."""
         url = f"{self.base_url}/task/{task_id}"
         
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         response.raise_for_status()
         return response.json()
     
@@ -64,6 +65,6 @@ class ClickupService:
             "description": description or ""
         }
         
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = self.session.post(url, json=payload)
         response.raise_for_status()
         return response.json() 
\ No newline at end of file
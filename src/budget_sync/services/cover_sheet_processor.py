@@ -1,5 +1,8 @@
 import time
 import logging
+from functools import lru_cache
+
+from src.budget_sync.utils.retry import is_rate_limited, retry_delay
 
 logger = logging.getLogger(__name__)
 
@@ -54,64 +57,107 @@ COVER_SHEET_MAPPING = {
     }
 }
 
+# Amount columns read for each firm bid category and the grand total
+MONEY_FIELDS = ('estimated', 'actual', 'variance', 'client_actual', 'client_variance')
+
+# Thousands separators and spaces dropped before parsing an amount
+_SEPARATOR_STRIP = str.maketrans('', '', ', ')
+
+@lru_cache(maxsize=None)
+def _parse_cell_ref(cell_ref):
+    """Convert an A1 cell reference to zero-based (row, column) indices, e.g. 'G22' -> (21, 6)."""
+    letters = cell_ref.rstrip('0123456789')
+    col = 0
+    for letter in letters.upper():
+        col = col * 26 + ord(letter) - ord('A') + 1
+    return int(cell_ref[len(letters):]) - 1, col - 1
+
+
+def _column_letters(col):
+    """Convert a zero-based column index to its A1 letters, e.g. 6 -> 'G'."""
+    letters = ''
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+
+def _bounding_block(cells):
+    """Return ``(top, left, a1_range)`` for the smallest rectangle covering ``cells``."""
+    rows, cols = zip(*(_parse_cell_ref(cell) for cell in cells))
+    top, left, bottom, right = min(rows), min(cols), max(rows), max(cols)
+    return top, left, f"{_column_letters(left)}{top + 1}:{_column_letters(right)}{bottom + 1}"
+
+
 def _batch_get_values(sheets_service, spreadsheet_id, ranges):
-    """Helper to fetch batch values with retry logic."""
+    """Helper to fetch batch values with retry logic.
+
+    Returns the 2D values of each range as a list aligned with ``ranges``.
+    """
     max_retries = 5
     base_delay = 2
     for attempt in range(max_retries):
         try:
-            logger.debug(f"[_batch_get_values] Attempt {attempt+1}: Fetching ranges: {ranges}")
+            logger.debug("[_batch_get_values] Attempt %s: Fetching ranges: %s", attempt+1, ranges)
             result = sheets_service.spreadsheets().values().batchGet(
                 spreadsheetId=spreadsheet_id,
                 ranges=ranges
             ).execute()
-            logger.debug(f"[_batch_get_values] Fetched result: {result}")
-            # Convert result to a dict with range as key
-            batch_values = {entry['range']: entry.get('values', [['']])[0] for entry in result.get('valueRanges', [])}
-            logger.debug(f"[_batch_get_values] Retrieved values for {len(batch_values)} ranges.")
+            logger.debug("[_batch_get_values] Fetched result: %s", result)
+            # Values of each range, in the order the ranges were requested
+            batch_values = [entry.get('values', []) for entry in result.get('valueRanges', [])]
+            logger.debug("[_batch_get_values] Retrieved values for %s ranges.", len(batch_values))
             return batch_values
         except Exception as e:
-            if 'RATE_LIMIT_EXCEEDED' in str(e) and attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                logger.info(f"[_batch_get_values] Rate limit exceeded; attempt {attempt+1}/{max_retries}. Retrying in {delay} seconds.")
+            if is_rate_limited(e) and attempt < max_retries - 1:
+                delay = retry_delay(e, base_delay * (2 ** attempt))
+                logger.info("[_batch_get_values] Rate limit exceeded; attempt %s/%s. Retrying in %.1f seconds.", attempt+1, max_retries, delay)
                 time.sleep(delay)
                 continue
-            logger.error(f"[_batch_get_values] Error on attempt {attempt+1}/{max_retries}: {e}")
+            logger.error("[_batch_get_values] Error on attempt %s/%s: %s", attempt+1, max_retries, e)
             raise
 
 
 def _format_money(value):
     """Format a number as a money string."""
-    logger.debug(f"[_format_money] Received value: {value}")
-    if value is None:
-        logger.debug("[_format_money] Value is None, returning default '$0.00'")
+    logger.debug("[_format_money] Received value: %s", value)
+    if value is None or value == '' or value == '$0.00':
         return "$0.00"
+    if isinstance(value, str):
+        return _format_money_text(value)
+    try:
+        formatted_value = '$' + format(float(value), ',.2f')
+        logger.debug("[_format_money] Formatted value: %s", formatted_value)
+        return formatted_value
+    except (ValueError, TypeError) as e:
+        logger.error("[_format_money] Error formatting value %s: %s", value, e)
+        return "$0.00"
+
+
+@lru_cache(maxsize=4096)
+def _format_money_text(value):
+    """Format a money string read from the sheet; cached because cell texts repeat across budgets."""
     try:
-        if isinstance(value, str):
-            v = value.strip()
-            negative = False
-            # Check if the value is in parentheses indicating a negative number
-            if v.startswith('(') and v.endswith(')'):
-                negative = True
-                v = v[1:-1].strip()
-            # Remove any leading '$'
-            if v.startswith('$'):
-                v = v[1:]
-            # Remove commas and spaces
-            v = v.replace(',', '').replace(' ', '')
-            num = float(v)
-            if negative:
-                num = -num
-            formatted_value = "${:,.2f}".format(num)
-            logger.debug(f"[_format_money] Formatted value: {formatted_value}")
-            return formatted_value
-        else:
-            num = float(value)
-            formatted_value = "${:,.2f}".format(num)
-            logger.debug(f"[_format_money] Formatted value: {formatted_value}")
-            return formatted_value
+        v = value.strip()
+        negative = False
+        # Check if the value is in parentheses indicating a negative number
+        if v.startswith('(') and v.endswith(')'):
+            negative = True
+            v = v[1:-1].strip()
+        # Remove any leading '$'
+        if v.startswith('$'):
+            v = v[1:]
+        # Remove commas and spaces
+        v = v.translate(_SEPARATOR_STRIP)
+        num = float(v)
+        if negative:
+            num = -num
+        formatted_value = '$' + format(num, ',.2f')
+        logger.debug("[_format_money] Formatted value: %s", formatted_value)
+        return formatted_value
     except (ValueError, TypeError) as e:
-        logger.error(f"[_format_money] Error formatting value {value}: {e}")
+        logger.error("[_format_money] Error formatting value %s: %s", value, e)
         return "$0.00"
 
 
@@ -127,64 +173,62 @@ def process_cover_sheet(sheets_service, spreadsheet_id, sheet_title, mapping=COV
     Returns:
         A dictionary with processed cover sheet data.
     """
-    # Collect ranges from the mapping
-    ranges_to_fetch = []
-    for cell in mapping['project_info'].values():
-        ranges_to_fetch.append(f"'{sheet_title}'!{cell}")
-    for cell in mapping['core_team'].values():
-        ranges_to_fetch.append(f"'{sheet_title}'!{cell}")
-    for cell in mapping['timeline'].values():
-        ranges_to_fetch.append(f"'{sheet_title}'!{cell}")
-    for category in mapping['firm_bid_summary'].values():
-        for field in ['estimated', 'actual', 'variance', 'client_actual', 'client_variance']:
-            if field in category:
-                ranges_to_fetch.append(f"'{sheet_title}'!{category[field]}")
-    for field in ['estimated', 'actual', 'variance', 'client_actual', 'client_variance']:
-        if field in mapping['grand_total']:
-            ranges_to_fetch.append(f"'{sheet_title}'!{mapping['grand_total'][field]}")
+    # A1 prefix shared by every cover sheet range
+    prefix = f"'{sheet_title}'!"
+
+    # Group the mapped cells into the project details block and the financials block
+    info_cells = [
+        cell
+        for section in ('project_info', 'core_team', 'timeline')
+        for cell in mapping[section].values()
+    ]
+    money_cells = [
+        category[field]
+        for category in mapping['firm_bid_summary'].values()
+        for field in MONEY_FIELDS
+        if field in category
+    ]
+    money_cells += [mapping['grand_total'][field] for field in MONEY_FIELDS if field in mapping['grand_total']]
+    cell_groups = [cells for cells in (info_cells, money_cells) if cells]
+
+    # Fetch one rectangle per group instead of one range per cell
+    blocks = [_bounding_block(cells) for cells in cell_groups]
+    ranges_to_fetch = [prefix + a1_range for _, _, a1_range in blocks]
     
-    logger.info(f"[Cover_Sheet] Fetching ranges: {ranges_to_fetch}")
+    logger.info("[Cover_Sheet] Fetching ranges: %s", ranges_to_fetch)
     batch_values = _batch_get_values(sheets_service, spreadsheet_id, ranges_to_fetch)
-    logger.debug(f"[Cover_Sheet] Raw batch values: {batch_values}")
+    logger.debug("[Cover_Sheet] Raw batch values: %s", batch_values)
     
-    # Process project info
-    project_info = {}
-    for field, cell in mapping['project_info'].items():
-        range_key = f"'{sheet_title}'!{cell}"
-        project_info[field] = batch_values.get(range_key, [''])[0] or ""
+    # Index each mapped cell into its block; the API trims empty trailing rows and columns
+    cell_values = {}
+    for cells, (top, left, _), block in zip(cell_groups, blocks, batch_values):
+        for cell in cells:
+            row, col = _parse_cell_ref(cell)
+            row_values = block[row - top] if row - top < len(block) else []
+            cell_values[cell] = row_values[col - left] if col - left < len(row_values) else ''
     
-    # Process core team
-    core_team = {}
-    for role, cell in mapping['core_team'].items():
-        range_key = f"'{sheet_title}'!{cell}"
-        core_team[role] = batch_values.get(range_key, [''])[0] or ""
-    
-    # Process timeline
-    timeline = {}
-    for milestone, cell in mapping['timeline'].items():
-        range_key = f"'{sheet_title}'!{cell}"
-        timeline[milestone] = batch_values.get(range_key, ['0'])[0] or "0"
+    # Process project info, core team and timeline
+    project_info = {field: cell_values[cell] or "" for field, cell in mapping['project_info'].items()}
+    core_team = {role: cell_values[cell] or "" for role, cell in mapping['core_team'].items()}
+    timeline = {milestone: cell_values[cell] or "0" for milestone, cell in mapping['timeline'].items()}
     
     # Process firm bid summary
-    firm_bid = {}
-    for category, details in mapping['firm_bid_summary'].items():
-        firm_bid[category] = {
+    firm_bid = {
+        category: {
             'description': details['description'],
-            'categories': details['categories']
+            'categories': details['categories'],
+            **{field: _format_money(cell_values[details[field]]) for field in MONEY_FIELDS if field in details}
         }
-        for field in ['estimated', 'actual', 'variance', 'client_actual', 'client_variance']:
-            if field in details:
-                range_key = f"'{sheet_title}'!{details[field]}"
-                value = batch_values.get(range_key, ['$0.00'])[0]
-                firm_bid[category][field] = _format_money(value)
+        for category, details in mapping['firm_bid_summary'].items()
+    }
     
     # Process grand total
     grand_total = {'description': mapping['grand_total']['description']}
-    for field in ['estimated', 'actual', 'variance', 'client_actual', 'client_variance']:
-        if field in mapping['grand_total']:
-            range_key = f"'{sheet_title}'!{mapping['grand_total'][field]}"
-            value = batch_values.get(range_key, ['$0.00'])[0]
-            grand_total[field] = _format_money(value)
+    grand_total.update(
+        (field, _format_money(cell_values[mapping['grand_total'][field]]))
+        for field in MONEY_FIELDS
+        if field in mapping['grand_total']
+    )
     
     processed_data = {
         'project_summary': {
@@ -197,5 +241,5 @@ def process_cover_sheet(sheets_service, spreadsheet_id, sheet_title, mapping=COV
             'grand_total': grand_total
         }
     }
-    logger.info(f"[Cover_Sheet] Processed data: {processed_data}")
+    logger.info("[Cover_Sheet] Processed data: %s", processed_data)
     return processed_data 
\ No newline at end of file
@@ -1,7 +1,7 @@
-import os
 import logging
 from typing import Dict, Any
 from .clickup_service import ClickupService
+from ..utils.env import require_env
 
 logger = logging.getLogger(__name__)
 
@@ -10,17 +10,9 @@ class JobSetupService:
     
     def __init__(self):
         self.clickup = ClickupService()
-        self.template_folder_id = os.getenv('CLICKUP_TEMPLATE_FOLDER_ID')
-        if not self.template_folder_id:
-            raise ValueError("CLICKUP_TEMPLATE_FOLDER_ID environment variable is required")
-            
-        self.budget_field_id = os.getenv('CLICKUP_BUDGET_FIELD_ID')
-        if not self.budget_field_id:
-            raise ValueError("CLICKUP_BUDGET_FIELD_ID environment variable is required")
-            
-        self.list_field_id = os.getenv('CLICKUP_LIST_FIELD_ID')
-        if not self.list_field_id:
-            raise ValueError("CLICKUP_LIST_FIELD_ID environment variable is required")
+        self.template_folder_id = require_env('CLICKUP_TEMPLATE_FOLDER_ID')
+        self.budget_field_id = require_env('CLICKUP_BUDGET_FIELD_ID')
+        self.list_field_id = require_env('CLICKUP_LIST_FIELD_ID')
     
     def create_job_structure(self, task_id: str) -> Dict[str, Any]:
         """Create job folder structure from template."""
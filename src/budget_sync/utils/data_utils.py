@@ -5,6 +5,9 @@ from datetime import datetime
 import json
 from typing import Any, Dict, List, Optional, Union
 
+# Lower-cased first-cell values that mark header/total rows rather than line items
+_SKIP_FIRST_CELLS = frozenset({'', 'estimate', 'total a,c'})
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder for datetime objects"""
     def default(self, obj):
@@ -12,6 +15,12 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+# Currency, separator, whitespace and percent characters dropped before float conversion
+_NUMBER_STRIP = str.maketrans('', '', '$, %')
+
+# Cell texts that mean "no value"
+_NULL_TEXTS = frozenset({'', '#N/A'})
+
 def safe_float_convert(value: Any) -> Optional[float]:
     """
     Safely convert a value to float, handling various formats:
@@ -21,18 +30,15 @@ def safe_float_convert(value: Any) -> Optional[float]:
     - Negative numbers in parentheses (e.g., '($1,234.56)')
     - Special values ('#N/A', '', None)
     """
-    if value is None or value == '' or value == '#N/A':
-        return None
-        
     if isinstance(value, (int, float)):
         return float(value)
         
     if isinstance(value, str):
-        # Remove currency symbols, commas, and whitespace
-        cleaned = value.replace('$', '').replace(',', '').replace(' ', '')
-        
-        # Remove percentage sign if present
-        cleaned = cleaned.replace('%', '')
+        if value in _NULL_TEXTS:
+            return None
+            
+        # Remove currency symbols, commas, whitespace and percentage signs
+        cleaned = value.translate(_NUMBER_STRIP)
         
         # Handle special case of '$0.00' or '0.00'
         if cleaned == '0.00' or cleaned == '0':
@@ -79,8 +85,7 @@ def process_budget_row(
             return None
             
         # Skip header, empty, and total rows
-        first_cell = str(row[0]).strip().lower()
-        if first_cell in ['estimate', '', 'total a,c'] or not first_cell:
+        if str(row[0]).strip().lower() in _SKIP_FIRST_CELLS:
             return None
             
         # Skip rows without class information
@@ -135,15 +140,15 @@ def extract_class_info(header: str) -> Optional[tuple[str, str]]:
         Tuple of (class_code, class_name) or None if invalid format
     """
     try:
-        if not header or ':' not in header:
+        if not header:
             return None
             
-        parts = header.split(':', 1)
-        if len(parts) != 2:
+        code, sep, name = header.partition(':')
+        if not sep:
             return None
             
-        code = parts[0].strip()
-        name = parts[1].strip()
+        code = code.strip()
+        name = name.strip()
         
         if not code or not name:
             return None
@@ -0,0 +1,12 @@
+"""
+Environment configuration helpers.
+"""
+import os
+
+
+def require_env(name: str) -> str:
+    """Return the value of a required environment variable, raising ValueError if it is unset or empty."""
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} environment variable is required")
+    return value
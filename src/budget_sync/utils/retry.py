@@ -0,0 +1,28 @@
+"""
+Helpers for retrying Google API calls that hit rate limits.
+"""
+import random
+
+from googleapiclient.errors import HttpError
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Return True for a 429 HttpError or any error reporting RATE_LIMIT_EXCEEDED."""
+    if isinstance(error, HttpError) and error.resp.status == 429:
+        return True
+    return 'RATE_LIMIT_EXCEEDED' in str(error)
+
+
+def retry_delay(error: Exception, backoff: float) -> float:
+    """Seconds to wait before retrying: at least ``backoff`` or the server's Retry-After, plus jitter.
+
+    The jitter (up to half of ``backoff``) keeps workers that share a quota from retrying in lockstep.
+    """
+    retry_after = 0.0
+    resp = getattr(error, 'resp', None)
+    if resp is not None:
+        try:
+            retry_after = float(resp.get('retry-after') or 0)
+        except (TypeError, ValueError):
+            pass
+    return max(retry_after, backoff) + random.uniform(0, 0.5 * backoff)
@@ -0,0 +1,41 @@
+import unittest
+from unittest.mock import Mock
+
+from src.budget_sync.services.bq_upload_logic import upload_line_items_to_bq
+
+
+class TestBQUploadLogic(unittest.TestCase):
+
+    def setUp(self):
+        self.bq_client = Mock()
+        self.bq_client.project = 'test-project'
+        self.bq_client.insert_rows_json.return_value = []
+
+    def test_upload_line_items_streams_in_chunks(self):
+        rows = ({'line_item_number': str(i)} for i in range(1201))
+
+        result = upload_line_items_to_bq(self.bq_client, 'dataset', 'budget_details', rows, chunk_size=500)
+
+        self.assertTrue(result)
+        chunk_sizes = [len(call.args[1]) for call in self.bq_client.insert_rows_json.call_args_list]
+        self.assertEqual(chunk_sizes, [500, 500, 201])
+        self.assertEqual(self.bq_client.insert_rows_json.call_args.args[0], 'test-project.dataset.budget_details')
+
+    def test_upload_line_items_passes_stable_row_ids(self):
+        rows = [{'budget_id': 'B-1.0.1', 'class_code': 'A', 'line_item_number': '3'},
+                {'budget_id': 'B-1.0.1', 'class_code': 'A', 'line_item_number': '3'}]
+
+        upload_line_items_to_bq(self.bq_client, 'dataset', 'budget_details', rows)
+        upload_line_items_to_bq(self.bq_client, 'dataset', 'budget_details', rows)
+
+        first, retry = self.bq_client.insert_rows_json.call_args_list
+        self.assertEqual(first.kwargs['row_ids'], ['B-1.0.1:A:3:0', 'B-1.0.1:A:3:1'])
+        self.assertEqual(retry.kwargs['row_ids'], first.kwargs['row_ids'])
+
+    def test_upload_line_items_empty(self):
+        self.assertTrue(upload_line_items_to_bq(self.bq_client, 'dataset', 'budget_details', []))
+        self.bq_client.insert_rows_json.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
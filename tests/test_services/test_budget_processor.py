@@ -1,6 +1,7 @@
 """
 Tests for the budget processor service.
 """
+import json
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
@@ -8,7 +9,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
-from budget_sync.services.budget_processor import BudgetProcessor
+from budget_sync.services.budget_processor import (
+    BudgetAuthenticationRequired, BudgetProcessor, _clean_name, _money_cell, _write_if_changed, retry_on_http_error
+)
+from budget_sync.models.budget import format_money
+from googleapiclient.errors import HttpError
+import httplib2
 
 import unittest
 
@@ -142,6 +148,144 @@ def test_process_line_item(processor):
         assert 'upload_timestamp' in result
         assert 'budget_name' in result 
 
+def test_clean_name():
+    """Test sanitizing spreadsheet and sheet titles for upload IDs."""
+    assert _clean_name('My Budget (v2)') == 'My_Budget_v2'
+    assert _clean_name('  GOOG0324_PIXEL  DR ') == 'GOOG0324_PIXEL_DR'
+    assert _clean_name('Café-Résumé') == 'Café_Résumé'
+    assert _clean_name('***') == ''
+
+def test_fetch_class_ranges_single_batch():
+    """Test that class header, line item and total ranges come from one batchGet."""
+    processor = BudgetProcessor.__new__(BudgetProcessor)
+    processor.sheets_service = Mock()
+    batch_get = processor.sheets_service.spreadsheets().values().batchGet
+    batch_get.return_value.execute.return_value = {'valueRanges': [
+        {'values': [['A', 'PREPRODUCTION & WRAP CREW']]},
+        {'values': [['1', 'Line Producer']]},
+        {'values': [['$100.00']]},
+        {'values': [['28%']]},
+        {'values': [['$128.00']]},
+        {'values': [['50']]},
+        {'values': [['$28%']]},
+        {},
+    ]}
+    fetched = processor._fetch_class_ranges('sheet_id', 'Budget', ['A'])
+
+    assert batch_get.call_count == 1
+    assert batch_get.call_args.kwargs['ranges'][0] == "'Budget'!L1:M1"
+    assert fetched['A']['line_items'] == [['1', 'Line Producer']]
+    assert processor._get_class_totals(fetched['A']) == {
+        'class_estimate_subtotal': 100.0,
+        'class_actual_subtotal': 50.0,
+        'class_estimate_pnw': 0.28,
+        'class_actual_pnw': 0.28,
+        'class_estimate_total': 128.0,
+        'class_actual_total': 0.0,
+    }
+
+def test_money_cell_keeps_negative_totals():
+    """Test that accounting-style and minus-sign negatives parse to negative amounts."""
+    assert _money_cell([['($1,234.00)']]) == -1234.0
+    assert _money_cell([['-$1,234.00']]) == -1234.0
+    assert _money_cell([['(5%)']]) == -0.05
+    assert format_money(-1234.0) == '-$1,234.00'
+    assert format_money(1234.5) == '$1,234.50'
+
+def test_sheet_rows_are_flat():
+    """Test that sheet rows carry flat class_* totals instead of the shared class_totals dict."""
+    processor = BudgetProcessor.__new__(BudgetProcessor)
+    class_totals = {'class_estimate_subtotal': 100.0, 'class_actual_subtotal': 0.0,
+                    'class_estimate_pnw': 0.28, 'class_actual_pnw': None,
+                    'class_estimate_total': 100.0, 'class_actual_total': 0.0}
+    row = {'line_item_number': '1', 'validation_status': 'valid', 'class_totals': class_totals}
+    budget_class = Mock(line_items=[row])
+    with patch.object(processor, '_fetch_class_ranges', return_value={code: {} for code in processor.CLASS_MAPPINGS}), \
+            patch.object(processor, '_process_class', side_effect=lambda *args: budget_class if args[2] == 'A' else None):
+        rows, summary = processor._sheet_rows('sheet_id', 'Budget')
+
+    assert len(rows) == 1
+    assert 'class_totals' not in rows[0]
+    assert rows[0]['class_estimate_subtotal'] == '$100.00'
+    assert rows[0]['class_estimate_pnw'] == '28%'
+    assert rows[0]['class_actual_pnw'] is None
+    assert summary == {'total_rows': 1, 'processed_classes': ['A'], 'validation_issues': 0}
+
+def test_cover_sheet_cache_returns_copies():
+    """Test that changing a returned cover sheet does not leak into later cache hits."""
+    processor = BudgetProcessor.__new__(BudgetProcessor)
+    processor._cover_sheet_cache = {}
+    processor.sheets_service = Mock()
+    cover_sheet = {'financials': {'grand_total': {'estimated': '$1,000.00'}}}
+    with patch('budget_sync.services.budget_processor.process_cover_sheet', return_value=cover_sheet) as fetch:
+        first = processor._process_cover_sheet('sheet_id', 'Cover')
+        first['financials']['grand_total']['estimated'] = 1000.0
+        second = processor._process_cover_sheet('sheet_id', 'Cover')
+
+    assert fetch.call_count == 1
+    assert second['financials']['grand_total']['estimated'] == '$1,000.00'
+
+def test_version_tracking_written_once_on_flush(tmp_path, monkeypatch):
+    """Test that version bumps stay in memory until flush_version_tracking."""
+    monkeypatch.chdir(tmp_path)
+    processor = BudgetProcessor.__new__(BudgetProcessor)
+    processor._tracking_data = None
+    processor._tracking_dirty = False
+
+    assert processor._get_version_numbers('File', 'Sheet', '01-02-25', {'a': 1}) == (1, 0, 1)
+    assert processor._get_version_numbers('File', 'Sheet', '01-02-25', {'a': 1}) == (1, 0, 2)
+    assert processor._get_version_numbers('File', 'Sheet', '01-02-25', {'a': 2}) == (1, 1, 1)
+    assert not (tmp_path / 'output' / 'version_tracking.json').exists()
+
+    processor.flush_version_tracking()
+
+    tracking = json.loads((tmp_path / 'output' / 'version_tracking.json').read_text())
+    assert tracking['File-Sheet']['minor_version'] == 1
+    assert tracking['File-Sheet']['first_seen'] == '01-02-25'
+
+def test_write_if_changed_keeps_file_mode(tmp_path):
+    """Test that rewriting a file keeps its permissions and new files are owner-only."""
+    token = tmp_path / 'token.json'
+    assert _write_if_changed(token, '{"refresh_token": "a"}')
+    assert token.stat().st_mode & 0o777 == 0o600
+
+    token.chmod(0o640)
+    assert _write_if_changed(token, '{"refresh_token": "b"}')
+    assert token.stat().st_mode & 0o777 == 0o640
+    assert token.read_text() == '{"refresh_token": "b"}'
+    assert not _write_if_changed(token, '{"refresh_token": "b"}')
+
+def test_non_interactive_without_token_raises(monkeypatch):
+    """Test that a non-interactive processor never starts the local OAuth flow."""
+    monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+    with patch('budget_sync.services.budget_processor.os.path.exists', return_value=False), \
+            patch('budget_sync.services.budget_processor.InstalledAppFlow') as flow:
+        with pytest.raises(BudgetAuthenticationRequired):
+            BudgetProcessor('sheet_id', non_interactive=True)
+    flow.from_client_secrets_file.assert_not_called()
+
+def test_valid_credentials_reused_across_instances(monkeypatch):
+    """Test that a second processor reuses still-valid credentials without touching token files."""
+    creds = Mock(valid=True)
+    monkeypatch.setattr('budget_sync.services.budget_processor._cached_creds', creds)
+    with patch('budget_sync.services.budget_processor.os.path.exists') as exists, \
+            patch('budget_sync.services.budget_processor.build') as build:
+        processor = BudgetProcessor('sheet_id', non_interactive=True)
+    exists.assert_not_called()
+    assert processor._creds is creds
+    assert build.call_args.kwargs['credentials'] is creds
+
+def test_retry_on_http_error_honours_retry_after_and_reraises():
+    """Test that retries wait at least Retry-After and re-raise once exhausted."""
+    error = HttpError(httplib2.Response({'status': 429, 'retry-after': '7'}), b'rate limited')
+    func = Mock(side_effect=error)
+    with patch('budget_sync.services.budget_processor.time.sleep') as sleep:
+        with pytest.raises(HttpError):
+            retry_on_http_error(max_retries=3)(func)()
+    assert func.call_count == 3
+    assert sleep.call_count == 2
+    assert all(call.args[0] >= 7 for call in sleep.call_args_list)
+
 class TestBudgetProcessor(unittest.TestCase):
     def test_some_functionality(self):
         # Dummy test for demonstration
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import Mock
 
 from src.budget_sync.services import cover_sheet_processor
 
@@ -16,10 +17,18 @@ class DummySpreadsheets:
         return self
 
     def batchGet(self, spreadsheetId, ranges):
-        # Construct dummy response: for each range, return a value that appends '_dummy' to the range string
+        # Construct dummy response: every cell of each range holds its own sheet-qualified A1 ref plus '_dummy'
         valueRanges = []
         for r in ranges:
-            valueRanges.append({'range': r, 'values': [[r + '_dummy']]})
+            prefix, _, a1_range = r.rpartition('!')
+            start, _, end = a1_range.partition(':')
+            top, left = cover_sheet_processor._parse_cell_ref(start)
+            bottom, right = cover_sheet_processor._parse_cell_ref(end or start)
+            values = [
+                [f"{prefix}!{cover_sheet_processor._column_letters(col)}{row + 1}_dummy" for col in range(left, right + 1)]
+                for row in range(top, bottom + 1)
+            ]
+            valueRanges.append({'range': r, 'values': values})
         return DummyExecuteResult(valueRanges)
 
 
@@ -48,6 +57,36 @@ class TestCoverSheetProcessor(unittest.TestCase):
         self.assertIn('firm_bid', financials, 'financials should have firm_bid')
         self.assertIn('grand_total', financials, 'financials should have grand_total')
 
+    def test_process_cover_sheet_values_by_position(self):
+        # Values are matched to fields by their position within the fetched blocks, not by the range string echoed back
+        result = cover_sheet_processor.process_cover_sheet(DummySheetsService(), 'dummy_id', 'Cover_Sheet')
+
+        project_info = result['project_summary']['project_info']
+        self.assertEqual(project_info['project_title'], "'Cover_Sheet'!C5_dummy")
+        self.assertEqual(result['project_summary']['timeline']['wrap_days'], "'Cover_Sheet'!D17_dummy")
+
+    def test_process_cover_sheet_fetches_blocks(self):
+        # Mapped cells are read from two rectangles; cells trimmed from the response default to empty
+        service = Mock()
+        batch_get = service.spreadsheets().values().batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'values': [['', '', '', '', '', '03/01/25'], ['Spot']]},
+            {'values': [['1000', '', '', '', '5']]},
+        ]}
+        result = cover_sheet_processor.process_cover_sheet(service, 'dummy_id', 'Cover_Sheet')
+
+        self.assertEqual(batch_get.call_args.kwargs['ranges'], ["'Cover_Sheet'!C4:H17", "'Cover_Sheet'!G22:K47"])
+
+        project_info = result['project_summary']['project_info']
+        self.assertEqual(project_info['date'], '03/01/25')
+        self.assertEqual(project_info['project_title'], 'Spot')
+        self.assertEqual(project_info['production_company'], '')
+        self.assertEqual(result['project_summary']['timeline']['wrap_days'], '0')
+        firm_bid = result['financials']['firm_bid']
+        self.assertEqual(firm_bid['pre_production_wrap']['estimated'], '$1,000.00')
+        self.assertEqual(firm_bid['pre_production_wrap']['client_variance'], '$5.00')
+        self.assertEqual(result['financials']['grand_total']['estimated'], '$0.00')
+
     def test_value_formatting(self):
         # Test that _format_money function works as expected
         from src.budget_sync.services import cover_sheet_processor
@@ -0,0 +1,24 @@
+# tests/test_utils/test_retry.py
+import httplib2
+from unittest.mock import patch
+from googleapiclient.errors import HttpError
+from budget_sync.utils.retry import is_rate_limited, retry_delay
+
+
+def _http_error(status, headers=None):
+    return HttpError(httplib2.Response({'status': status, **(headers or {})}), b'error')
+
+
+def test_is_rate_limited():
+    """Test that 429 responses and RATE_LIMIT_EXCEEDED messages count as rate limiting."""
+    assert is_rate_limited(_http_error(429))
+    assert is_rate_limited(Exception('RATE_LIMIT_EXCEEDED: quota'))
+    assert not is_rate_limited(_http_error(404))
+
+
+def test_retry_delay_uses_retry_after_and_jitter():
+    """Test that the delay covers Retry-After or the backoff, plus up to half the backoff in jitter."""
+    with patch('budget_sync.utils.retry.random.uniform', side_effect=lambda low, high: high):
+        assert retry_delay(_http_error(429, {'retry-after': '10'}), 4) == 12
+        assert retry_delay(_http_error(429), 4) == 6
+        assert retry_delay(Exception('RATE_LIMIT_EXCEEDED'), 2) == 3